@@ -1,11 +1,16 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
+import os
 from datetime import datetime
 
+from backend import DATASETS, open_backend
+from trends import movers
+from cooccurrence import combine_years, cooccurrence_by_year, related_topics, spring_layout, top_network
+from video import video_html
+
 # Page configuration
 st.set_page_config(
     page_title="Programming Language Trends in Bioinformatics",
@@ -19,67 +24,34 @@ st.markdown("### Analysis of GitHub Repositories (2013-2025)")
 st.markdown("Github repo: [https://github.com/jpsglouzon/bio-lang-race](https://github.com/jpsglouzon/bio-lang-race)")
 st.markdown("Let's chat: [Biostar](https://www.biostars.org/p/9616968/) & [r/bioinformatics](https://www.reddit.com/r/bioinformatics/comments/1q1ulir/analyzing_15_years_of_bioinformatics_how/)")
 
-# # Load data
-# topic='bioinformatics'
-# list_of_repos_path='../data/list_of_repos_'+topic+'.csv'
-# stats_repo_pl_vs_topic_df_path='../data/programming_language_x_'+topic+'.csv'
-# stats_repo_topics_vs_topic_df_path='../data/topics_x_'+topic+'.csv'
-
-with st.spinner("Loading data ...", show_time=False):
-    
-    list_of_repos_path='https://github.com/jpsglouzon/bio-lang-race/blob/main/data/list_of_repos_bioinformatics.csv?raw=true' 
-    stats_repo_pl_vs_topic_df_path='https://github.com/jpsglouzon/bio-lang-race/blob/main/data/programming_language_x_bioinformatics.csv?raw=true'
-    stats_repo_topics_vs_topic_df_path='https://github.com/jpsglouzon/bio-lang-race/blob/main/data/topics_x_bioinformatics.csv?raw=true'
-
-    # Load datasets
-    df_repos = pd.read_csv(list_of_repos_path, sep=';',header=0,on_bad_lines='skip')
-    df_lang = pd.read_csv(stats_repo_pl_vs_topic_df_path, sep=';',header=0)
-    df_topics = pd.read_csv(stats_repo_topics_vs_topic_df_path, sep=';',header=0)    
-
-# Convert topics column from string representation to actual list if needed
-if 'topics' in df_repos.columns and isinstance(df_repos['topics'].iloc[0], str):
-    import ast
-    df_repos['topics'] = df_repos['topics'].apply(lambda x: ast.literal_eval(x) if pd.notna(x) else [])
-    
-    
-# Calculate top 1 language and topic
-top_lang_stars = df_lang.groupby('language')['stars'].sum().idxmax()
-top_lang_forks = df_lang.groupby('language')['forks'].sum().idxmax()
-top_topic_stars = df_topics.groupby('topic')['stars'].sum().idxmax()
-top_topic_forks = df_topics.groupby('topic')['forks'].sum().idxmax()    
-
-# General Statistics
-col1, col2, col3, col4, col5, col6, col7= st.columns(7)
-
-with col1:
-    st.metric(label="🌟 Top Language (Stars)", value=top_lang_stars,delta='Forks: '+top_lang_forks,delta_color='off')
-
-with col2:
-    st.metric("🏷️ Top Topic (Stars)", top_topic_stars,delta='Forks: '+top_topic_forks,delta_color='off')
-    
-with col3:
-    st.metric("Total Repositories", f"{len(df_repos):,}")
-with col4:
-
-    st.metric("Programming Languages", f"{df_lang['language'].nunique()}")
-with col5:
-    st.metric("Total Stars", f"{df_repos['stars'].sum():,}")
-with col6:
-    st.metric("Total Forks", f"{df_repos['forks'].sum():,}")
-with col7:
-    st.metric("Year Range", f"{df_lang['year'].min()}-{df_lang['year'].max()}")
-
+# Load data
+topic='bioinformatics'
+data_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
 
+# Chart data comes from the pandas backend, or from SQL queries when BIO_LANG_RACE_DB is set.
+# Refreshed datasets are loaded in the background and swapped in (checked every 30 s)
+backend = open_backend(data_dir, topic, watch_interval=30)
+available_years = backend.years()
 
-#     # General Statistics - Quick Overview
-#     col1, col2, col3, col4 = st.columns(4)
+# Race chart videos are played from the local figure folder (see video.py and media_server.py)
+figure_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'figure')
+media_url=os.environ.get('BIO_LANG_RACE_MEDIA_URL')
 
+def race_video(filename):
+    path = os.path.join(figure_dir, filename)
+    if media_url:
+        # Served by media_server.py with range requests, the browser picks the variant for its viewport
+        st.html(video_html(media_url, path))
+    else:
+        # Streamlit media endpoint (range requests too), the file is stored once for all sessions.
+        # Always the full-size file without poster: the variants need media_server.py (see README)
+        st.video(path, format="video/mp4")
 
 # Sidebar filters
 st.sidebar.header("🎛️ Filters")
 
 # Get all unique languages
-all_languages = sorted(df_lang['language'].unique().tolist())
+all_languages = backend.languages()
 default_languages = ['Python', 'C', 'C++', 'R', 'Java', 'JavaScript', 'Perl', 'Shell', 'Jupyter Notebook', 'Go']
 default_languages = [lang for lang in default_languages if lang in all_languages]
 
@@ -90,8 +62,8 @@ selected_languages = st.sidebar.multiselect(
 )
 
 # Year range filter
-min_year = int(df_lang['year'].min())
-max_year = int(df_lang['year'].max())
+min_year = int(min(available_years))
+max_year = int(max(available_years))
 year_range = st.sidebar.slider(
     "Select Year Range",
     min_value=min_year,
@@ -106,26 +78,50 @@ metric_type = st.sidebar.radio(
     index=0
 )
 
-# Filter data based on selections
-df_lang_filtered = df_lang[
-    (df_lang['language'].isin(selected_languages)) &
-    (df_lang['year'] >= year_range[0]) &
-    (df_lang['year'] <= year_range[1])
-]
+with st.spinner("Loading data ...", show_time=False):
+
+    # Overview of the selected years, sliced from the dataset store shared by all sessions
+    overview = backend.overview(year_range)
 
-df_topics_filtered = df_topics[
-    (df_topics['year'] >= year_range[0]) &
-    (df_topics['year'] <= year_range[1])
-]
+if overview is None:
+    st.warning(f"No data available between {year_range[0]} and {year_range[1]}.")
+    st.stop()
+
+# Calculate top 1 language and topic
+top_lang_stars = overview['top_lang_stars']
+top_lang_forks = overview['top_lang_forks']
+top_topic_stars = overview['top_topic_stars']
+top_topic_forks = overview['top_topic_forks']
+
+# General Statistics
+col1, col2, col3, col4, col5, col6, col7= st.columns(7)
+
+with col1:
+    st.metric(label="🌟 Top Language (Stars)", value=top_lang_stars,delta='Forks: '+top_lang_forks,delta_color='off')
+
+with col2:
+    st.metric("🏷️ Top Topic (Stars)", top_topic_stars,delta='Forks: '+top_topic_forks,delta_color='off')
+    
+with col3:
+    st.metric("Total Repositories", f"{overview['repositories']:,}")
+with col4:
+
+    st.metric("Programming Languages", f"{overview['languages']}")
+with col5:
+    st.metric("Total Stars", f"{overview['stars']:,}")
+with col6:
+    st.metric("Total Forks", f"{overview['forks']:,}")
+with col7:
+    st.metric("Year Range", f"{overview['min_year']}-{overview['max_year']}")
+
+
+
+#     # General Statistics - Quick Overview
+#     col1, col2, col3, col4 = st.columns(4)
 
-df_repos_filtered = df_repos[
-    (df_repos['language'].isin(selected_languages)) &
-    (df_repos['selected_year'] >= year_range[0]) &
-    (df_repos['selected_year'] <= year_range[1])
-]
 
 # Create tabs
-tab0, tab1, tab2, tab3 = st.tabs(["📋 Summary", "📈 Programming Language and Topics Trends", "🌟 Top 20 Repositories", "📊 Data"])
+tab0, tab1, tab_movers, tab_network, tab2, tab3 = st.tabs(["📋 Summary", "📈 Programming Language and Topics Trends", "🚀 Movers", "🕸️ Topic Network", "🌟 Top 20 Repositories", "📊 Data"])
 
 # TAB 0: GENERAL
 with tab0:
@@ -139,8 +135,9 @@ with tab0:
         st.markdown("#### 🔝 Top 10 Programming Languages")
 
         # Calculate top 10 languages by stars
-        top_10_lang_stars = df_lang.groupby('language')['stars'].sum().nlargest(10)
-        total_stars = df_lang['stars'].sum()
+        lang_stars = backend.entity_totals('language', year_range, 'stars')
+        top_10_lang_stars = lang_stars.head(10)
+        total_stars = lang_stars.sum()
 
         st.markdown("**By Stars:**")
         for i, (lang, stars) in enumerate(top_10_lang_stars.items(), 1):
@@ -150,8 +147,9 @@ with tab0:
         st.markdown("")
 
         # Calculate top 10 languages by forks
-        top_10_lang_forks = df_lang.groupby('language')['forks'].sum().nlargest(10)
-        total_forks = df_lang['forks'].sum()
+        lang_forks = backend.entity_totals('language', year_range, 'forks')
+        top_10_lang_forks = lang_forks.head(10)
+        total_forks = lang_forks.sum()
 
         st.markdown("**By Forks:**")
         for i, (lang, forks) in enumerate(top_10_lang_forks.items(), 1):
@@ -162,24 +160,26 @@ with tab0:
         st.markdown("#### 🏷️ Top 10 Topics")
 
         # Calculate top 10 topics by stars
-        top_10_topics_stars = df_topics.groupby('topic')['stars'].sum().nlargest(10)
-        total_topic_stars = df_topics['stars'].sum()
+        topic_stars = backend.entity_totals('topic', year_range, 'stars')
+        top_10_topics_stars = topic_stars.head(10)
+        total_topic_stars = topic_stars.sum()
 
         st.markdown("**By Stars:**")
-        for i, (topic, stars) in enumerate(top_10_topics_stars.items(), 1):
+        for i, (topic_name, stars) in enumerate(top_10_topics_stars.items(), 1):
             percentage = (stars / total_topic_stars) * 100
-            st.markdown(f"{i}. **{topic}**: {stars:,} stars ({percentage:.1f}%)")
+            st.markdown(f"{i}. **{topic_name}**: {stars:,} stars ({percentage:.1f}%)")
 
         st.markdown("")
 
         # Calculate top 10 topics by forks
-        top_10_topics_forks = df_topics.groupby('topic')['forks'].sum().nlargest(10)
-        total_topic_forks = df_topics['forks'].sum()
+        topic_forks = backend.entity_totals('topic', year_range, 'forks')
+        top_10_topics_forks = topic_forks.head(10)
+        total_topic_forks = topic_forks.sum()
 
         st.markdown("**By Forks:**")
-        for i, (topic, forks) in enumerate(top_10_topics_forks.items(), 1):
+        for i, (topic_name, forks) in enumerate(top_10_topics_forks.items(), 1):
             percentage = (forks / total_topic_forks) * 100
-            st.markdown(f"{i}. **{topic}**: {forks:,} forks ({percentage:.1f}%)")
+            st.markdown(f"{i}. **{topic_name}**: {forks:,} forks ({percentage:.1f}%)")
 
 # TAB 1: TRENDS
 with tab1:
@@ -190,11 +190,8 @@ with tab1:
 
     with col1:
 
-        # Language rank chart
-        df_lang_rank_comp = df_lang_filtered.groupby(['year', 'language'])[metric_type].sum().reset_index()
-        
-        # Calculate rank for each year - rank 1 = highest stars/forks
-        df_lang_rank_comp['rank'] = df_lang_rank_comp.groupby('year')[metric_type].rank(method='dense', ascending=False).astype(int)
+        # Language rank chart, rank 1 = highest stars/forks for each year
+        df_lang_rank_comp = backend.ranks('language', year_range, metric_type, languages=selected_languages)
         
         # Sort legend by final rank (most recent year)
         if len(df_lang_rank_comp) > 0:
@@ -250,15 +247,8 @@ with tab1:
         st.plotly_chart(fig_lang_comp, use_container_width=True)
 
     with col2:
-        # Topics percentage chart
-        df_topics_rank_comp = df_topics_filtered.groupby(['year', 'topic'])[metric_type].sum().reset_index()
-        
-        # Get top 10 topics by total stars/forks
-        top_topics = df_topics_rank_comp.groupby('topic')[metric_type].sum().nlargest(10).index
-        df_topics_rank_comp = df_topics_rank_comp[df_topics_rank_comp['topic'].isin(top_topics)]
-        
-        # Calculate rank for each year - rank 1 = highest stars/forks
-        df_topics_rank_comp['rank'] = df_topics_rank_comp.groupby('year')[metric_type].rank(method='dense', ascending=False).astype(int)
+        # Top 10 topics by total stars/forks, ranked for each year - rank 1 = highest stars/forks
+        df_topics_rank_comp = backend.ranks('topic', year_range, metric_type, top_n=10)
         
         # Sort legend by final rank (most recent year)
         if len(df_topics_rank_comp) > 0:
@@ -299,11 +289,7 @@ with tab1:
 
         with col1:
             # Language percentage chart
-            df_lang_pct_comp = df_lang_filtered.groupby(['year', 'language'])[metric_type].sum().reset_index()
-            year_totals_comp = df_lang_pct_comp.groupby('year')[metric_type].sum().reset_index()
-            year_totals_comp.columns = ['year', 'total']
-            df_lang_pct_comp = df_lang_pct_comp.merge(year_totals_comp, on='year')
-            df_lang_pct_comp['percentage'] = (df_lang_pct_comp[metric_type] / df_lang_pct_comp['total']) * 100
+            df_lang_pct_comp = backend.percentages('language', year_range, metric_type, languages=selected_languages)
 
             fig_lang_comp = px.line(
                 df_lang_pct_comp,
@@ -319,17 +305,8 @@ with tab1:
             st.plotly_chart(fig_lang_comp, use_container_width=True)
 
         with col2:
-            # Topics percentage chart
-            df_topics_pct = df_topics_filtered.groupby(['year', 'topic'])[metric_type].sum().reset_index()
-
-            # Get top 10 topics by total stars/forks
-            top_topics = df_topics_pct.groupby('topic')[metric_type].sum().nlargest(10).index
-            df_topics_pct = df_topics_pct[df_topics_pct['topic'].isin(top_topics)]
-
-            year_totals_topics = df_topics_pct.groupby('year')[metric_type].sum().reset_index()
-            year_totals_topics.columns = ['year', 'total']
-            df_topics_pct = df_topics_pct.merge(year_totals_topics, on='year')
-            df_topics_pct['percentage'] = (df_topics_pct[metric_type] / df_topics_pct['total']) * 100
+            # Topics percentage chart, top 10 topics by total stars/forks
+            df_topics_pct = backend.percentages('topic', year_range, metric_type, top_n=10)
 
             fig_topics_comp = px.line(
                 df_topics_pct,
@@ -353,7 +330,7 @@ with tab1:
 
             st.subheader(f"Raw Count of {metric_type.capitalize()} by Language")
             fig2 = px.line(
-                df_lang_filtered.groupby(['year', 'language'])[metric_type].sum().reset_index(),
+                backend.yearly('language', year_range, metric_type, languages=selected_languages),
                 x='year',
                 y=metric_type,
                 color='language',
@@ -368,8 +345,7 @@ with tab1:
         with col2:
 
             st.subheader(f"Cumulative Count of {metric_type.capitalize()} by Language")
-            df_cumulative = df_lang_filtered.groupby(['year', 'language'])[metric_type].sum().reset_index()
-            df_cumulative['cumulative'] = df_cumulative.groupby('language')[metric_type].cumsum()
+            df_cumulative = backend.cumulative('language', year_range, metric_type, languages=selected_languages)
 
             fig3 = px.line(
                 df_cumulative,
@@ -393,14 +369,12 @@ with tab1:
     with col_race1:
         st.markdown("##### Programming Languages Race Chart")
 
-        mp4_url_programming_language_x_bioinformatics = "https://github.com/jpsglouzon/bio-lang-race/blob/main/figure/programming_language_x_bioinformatics.mp4?raw=true"
-        st.video(mp4_url_programming_language_x_bioinformatics, format="video/mp4")
+        race_video('programming_language_x_' + topic + '.mp4')
 
     with col_race2:
         st.markdown("##### Topics Race Chart")
 
-        mp4_url_topics_x_bioinformatics = "https://github.com/jpsglouzon/bio-lang-race/blob/main/figure/topics_x_bioinformatics.mp4?raw=true"
-        st.video(mp4_url_topics_x_bioinformatics, format="video/mp4")
+        race_video('topics_x_' + topic + '.mp4')
     st.markdown("---")
 
 
@@ -412,27 +386,205 @@ with tab1:
     with col_race1:
         st.markdown("##### Programming Languages Race Chart")
 
-        mp4_url_programming_language_x_bioinformatics_full = "https://github.com/jpsglouzon/bio-lang-race/blob/main/figure/programming_language_x_bioinformatics_full.mp4?raw=true"
-        st.video(mp4_url_programming_language_x_bioinformatics_full, format="video/mp4")
+        race_video('programming_language_x_' + topic + '_full.mp4')
 
     with col_race2:
         st.markdown("##### Topics Race Chart")
 
-        mp4_url_topics_x_bioinformatics = "https://github.com/jpsglouzon/bio-lang-race/blob/main/figure/topics_x_bioinformatics_20.mp4?raw=true"
-        st.video(mp4_url_topics_x_bioinformatics, format="video/mp4")
+        race_video('topics_x_' + topic + '_20.mp4')
     st.markdown("---")
             
+# TAB MOVERS: FASTEST RISING LANGUAGES AND TOPICS
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_movers(_backend, topic, version, entity, year_range, metric, year, window):
+    # Growth, rank change and momentum for every language/topic, cached across sessions and per dataset version
+    df_yearly = _backend.yearly(entity, year_range, metric)
+    return movers(df_yearly, entity, metric, year=year, window=window)
+
+with tab_movers:
+    st.header("🚀 Movers")
+    st.markdown("Fastest rising languages and topics, ranked by momentum: the trend of their share of "
+                f"{metric_type} over the last years (percentage points per year).")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        movers_choice = st.radio("Movers Among", options=['Topics', 'Languages'], horizontal=True)
+    with col2:
+        # The first year of the range has no previous year to compute a momentum from
+        movers_years = [year for year in available_years if year_range[0] <= year <= year_range[1]][1:]
+        movers_year = st.selectbox("Movers Year", options=sorted(movers_years, reverse=True), index=0)
+    with col3:
+        movers_window = st.slider("Trend Window (Years)", min_value=2, max_value=5, value=3)
+
+    movers_entity = 'topic' if movers_choice == 'Topics' else 'language'
+    if movers_year is not None:
+        df_movers = compute_movers(backend, topic, backend.version(), movers_entity, year_range, metric_type, movers_year, movers_window)
+        df_movers = df_movers.dropna(subset=['momentum'])
+
+    if movers_year is None:
+        st.info("Select a year range covering at least two years to compute movers.")
+    elif df_movers.empty:
+        st.info(f"No {movers_choice.lower()} with {metric_type} in {movers_year}.")
+    else:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            df_rising = df_movers.head(15)
+            fig_rising = px.bar(
+                df_rising,
+                x='momentum',
+                y=movers_entity,
+                orientation='h',
+                color='rank_change',
+                hover_data=['share', 'growth', 'rank'],
+                labels={'momentum': 'Momentum (pts/year)', movers_entity: movers_entity.capitalize(), 'rank_change': 'Rank Change'},
+                title=f'Rising Fastest in {movers_year}',
+                color_continuous_scale='Tealgrn'
+            )
+            fig_rising.update_layout(height=550, yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig_rising, use_container_width=True)
+
+        with col2:
+            df_falling = df_movers.tail(15)
+            fig_falling = px.bar(
+                df_falling,
+                x='momentum',
+                y=movers_entity,
+                orientation='h',
+                color='rank_change',
+                hover_data=['share', 'growth', 'rank'],
+                labels={'momentum': 'Momentum (pts/year)', movers_entity: movers_entity.capitalize(), 'rank_change': 'Rank Change'},
+                title=f'Falling Fastest in {movers_year}',
+                color_continuous_scale='Peach'
+            )
+            fig_falling.update_layout(height=550, yaxis={'categoryorder': 'total descending'})
+            st.plotly_chart(fig_falling, use_container_width=True)
+
+        with st.expander(f"All {movers_choice} ({len(df_movers)})"):
+            st.dataframe(
+                df_movers.rename(columns={
+                    'share': '% Share',
+                    'rolling_share': f'% Share ({movers_window}y Avg)',
+                    'growth': '% Growth',
+                    'rank_change': 'Rank Change',
+                    'momentum': 'Momentum'
+                }).round(2),
+                use_container_width=True,
+                height=400
+            )
+
+# TAB NETWORK: TOPIC CO-OCCURRENCE
+@st.cache_resource(show_spinner=False, max_entries=8)
+def compute_cooccurrence(_backend, topic, version, year_range, weight):
+    # Sparse topic x topic co-occurrence per year, shared read-only across sessions, per dataset version
+    df_repo_topics = _backend.repo_topics(year_range)
+    topic_vocabulary = _backend.topic_vocabulary()
+    return topic_vocabulary, cooccurrence_by_year(df_repo_topics, len(topic_vocabulary), weight)
+
+def warm_caches(new_backend):
+    # Default views of the Movers and Topic Network tabs, computed in the background on a refreshed
+    # dataset before it is swapped in, so that the first rerun on the new version hits the caches
+    years = new_backend.years()
+    full_range = (min(years), max(years))
+    for entity in ('topic', 'language'):
+        compute_movers(new_backend, topic, new_backend.version(), entity, full_range, 'stars', max(years), 3)
+    compute_cooccurrence(new_backend, topic, new_backend.version(), full_range, None)
+    # Summary tab queries, whose results the SQL backend caches per database version
+    new_backend.overview(full_range)
+    for entity in ('language', 'topic'):
+        for metric in ('stars', 'forks'):
+            new_backend.entity_totals(entity, full_range, metric)
+
+backend.on_reload('warm_caches', warm_caches)
+
+with tab_network:
+    st.header("🕸️ Topic Network")
+    st.markdown("Topics appearing together on the same repositories. Node size is the number of repositories "
+                "tagged with the topic, edge width the number of repositories sharing both topics.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        network_years = [year for year in available_years if year_range[0] <= year <= year_range[1]]
+        network_year = st.selectbox("Network Year", options=['All Years'] + sorted(network_years, reverse=True), index=0)
+    with col2:
+        network_weight = st.radio("Count Co-occurrences By", options=['Repositories', metric_type.capitalize()], horizontal=True)
+    with col3:
+        network_nodes = st.slider("Number of Topics", min_value=10, max_value=80, value=40, step=5)
+    with col4:
+        network_min_weight = st.slider("Minimum Co-occurrences", min_value=1, max_value=20, value=2)
+
+    weight = None if network_weight == 'Repositories' else metric_type
+    topic_vocabulary, cooc_by_year = compute_cooccurrence(backend, topic, backend.version(), year_range, weight)
+    cooc = combine_years(cooc_by_year, None if network_year == 'All Years' else [network_year])
+
+    if cooc is None or cooc.nnz == 0:
+        st.info("No topics found for this selection.")
+    else:
+        # The reference topic is on every repository, it is left out of the network
+        df_nodes, df_edges = top_network(cooc, topic_vocabulary, n_nodes=network_nodes, min_weight=network_min_weight, exclude=[topic])
+        pos = spring_layout(len(df_nodes), df_edges)
+
+        fig_network = go.Figure()
+        max_weight = df_edges['weight'].max() if len(df_edges) else 1
+        for edge in df_edges.itertuples():
+            fig_network.add_trace(go.Scatter(
+                x=[pos[edge.source, 0], pos[edge.target, 0]],
+                y=[pos[edge.source, 1], pos[edge.target, 1]],
+                mode='lines',
+                line={'width': 0.5 + 4 * edge.weight / max_weight, 'color': 'rgba(102, 51, 153, 0.3)'},
+                hoverinfo='skip',
+                showlegend=False
+            ))
+        fig_network.add_trace(go.Scatter(
+            x=pos[:, 0],
+            y=pos[:, 1],
+            mode='markers+text',
+            text=df_nodes['topic'],
+            textposition='top center',
+            marker={'size': 8 + 30 * np.sqrt(df_nodes['repositories'] / df_nodes['repositories'].max()), 'color': 'rebeccapurple'},
+            customdata=df_nodes['repositories'],
+            hovertemplate='%{text}: %{customdata:,.0f}<extra></extra>',
+            showlegend=False
+        ))
+        fig_network.update_layout(
+            height=700,
+            title=f'Topic Co-occurrence Network ({network_year})',
+            xaxis={'visible': False},
+            yaxis={'visible': False},
+            template='presentation'
+        )
+        st.plotly_chart(fig_network, use_container_width=True)
+
+        st.markdown("#### 🔎 Related Topics")
+        topic_frequency = cooc.diagonal()
+        topic_options = [topic_vocabulary[i] for i in np.argsort(-topic_frequency, kind='stable') if topic_frequency[i] > 0 and topic_vocabulary[i] != topic]
+        related_to = st.selectbox("Find Topics Related To", options=topic_options, index=0)
+
+        df_related = related_topics(cooc, topic_vocabulary, related_to, n=15, exclude=[topic])
+        fig_related = px.bar(
+            df_related,
+            x='repositories',
+            y='topic',
+            orientation='h',
+            color='score',
+            labels={'repositories': network_weight, 'topic': 'Topic', 'score': 'Association'},
+            title=f'Topics Most Often Used With {related_to}',
+            color_continuous_scale='Purples'
+        )
+        fig_related.update_layout(height=500, yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig_related, use_container_width=True)
+
 # TAB 2: TOPICS & RACE COMPARISONS (MERGED)
 with tab2:
     st.header("🌟 Top 20 Repositories")
 
     selected_year = st.selectbox(
         "Select Year",
-        options=sorted(df_repos_filtered['selected_year'].unique(), reverse=True),
+        options=backend.repo_years(year_range, selected_languages),
         index=0
     )
 
-    df_top_repos = df_repos_filtered[df_repos_filtered['selected_year'] == selected_year].nlargest(20, metric_type)
+    df_top_repos = backend.top_repos(year_range, selected_languages, selected_year, metric_type, n=20)
 
     fig_top_repos = px.bar(
         df_top_repos,
@@ -453,24 +605,33 @@ with tab2:
     )
     st.plotly_chart(fig_top_repos, use_container_width=True)
 
+    st.markdown("---")
+
+    # Distribution summed from the precomputed log-binned counts of the selected years and languages
+    df_distribution = backend.histogram(metric_type, year_range, selected_languages)
+
+    fig_distribution = px.bar(
+        df_distribution,
+        x='label',
+        y='repositories',
+        labels={'label': f'{metric_type.capitalize()} (log bins)', 'repositories': 'Repositories'},
+        title=f'Distribution of {metric_type.capitalize()} per Repository ({year_range[0]}-{year_range[1]})',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_distribution.update_layout(height=450, bargap=0.05)
+    st.plotly_chart(fig_distribution, use_container_width=True)
+
 # TAB 3: DATA
 with tab3:
     st.header("📊 Dataset Explorer")
 
     dataset_choice = st.selectbox(
         "Select Dataset to View",
-        options=['Repositories', 'Language Trends', 'Topics Trends']
+        options=list(DATASETS)
     )
 
-    if dataset_choice == 'Repositories':
-        data_to_show = df_repos_filtered.copy()
-        st.subheader(f"Repositories Dataset ({len(data_to_show)} records)")
-    elif dataset_choice == 'Language Trends':
-        data_to_show = df_lang_filtered.copy()
-        st.subheader(f"Language Trends Dataset ({len(data_to_show)} records)")
-    else:
-        data_to_show = df_topics_filtered.copy()
-        st.subheader(f"Topics Trends Dataset ({len(data_to_show)} records)")
+    data_to_show = backend.rows(dataset_choice, year_range, selected_languages)
+    st.subheader(f"{dataset_choice} Dataset ({len(data_to_show)} records)")
 
     # Sorting options
     sort_column = st.selectbox("Sort by Column", options=data_to_show.columns.tolist())
@@ -0,0 +1,541 @@
+"""Data backends serving the dashboard charts.
+
+Each chart of `app.py` gets its data from one backend method, so the same
+page can be served from two backends:
+
+- `PandasBackend` computes everything in pandas on the read-only store
+  shared by all sessions of the process (store.py, default).
+- `SqlBackend` runs parameterized queries against an embedded SQLite
+  database holding all reference topics. Nothing but the query results is
+  held by the Streamlit process, and results are cached per process.
+
+The app uses the SQL backend when the `BIO_LANG_RACE_DB` environment
+variable points to a database built with:
+
+    python backend.py build bioinformatics database --db ../data/bio_lang_race.sqlite
+
+The database is built in a temporary file that then replaces the served
+one, so a running dashboard sees a single new version (the file mtime). Its
+connections are reopened on the next query, and a watcher thread runs the
+warmups registered by the app on the new version.
+"""
+
+import argparse
+import functools
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from histograms import N_BINS, histogram_frame, sum_histograms
+from partitions import list_topics, list_years, load_partitioned
+from series import densify
+from store import STATS_DATASETS, add_warmup, shared_store
+from tables import DATA_DIR, canonical_tables, load_tables, load_topic_mapping, topic_names
+
+
+METRICS = ('stars', 'forks')
+ENTITIES = ('language', 'topic')
+
+DATASETS = ('Repositories', 'Language Trends', 'Topics Trends')
+
+
+class PandasBackend:
+    """Charts computed in pandas on the store shared by all sessions."""
+
+    def __init__(self, data_dir, topic, watch_interval=None, store=None):
+        self.data_dir = data_dir
+        self.topic = topic
+        # Current version of the shared store, kept for the whole rerun even if a newer one is swapped in
+        self.store = store or shared_store(data_dir, topic, watch_interval)
+        self.repo_tables = self.store.repo_tables
+
+    def version(self):
+        return self.store.version
+
+    def on_reload(self, name, warmup):
+        # warmup(backend) runs on a backend of each new dataset version, before it is swapped in
+        add_warmup(self.data_dir, self.topic, name, lambda store: warmup(PandasBackend(self.data_dir, self.topic, store=store)))
+
+    def languages(self):
+        return sorted(self.repo_tables['languages']['language'].tolist())
+
+    def years(self):
+        return self.store.years['language']
+
+    def _stats(self, entity, year_range, languages=None):
+        # View on the shared rows of the year range, masked copy only when filtering languages
+        df = self.store.select(entity, year_range)
+        if languages is not None:
+            df = df[df['language'].isin(languages)]
+        return df
+
+    def _repos(self, year_range, languages):
+        df = self.store.select('repos', year_range)
+        return df[df['language'].isin(languages)]
+
+    def overview(self, year_range):
+        df_lang = self.store.select('language', year_range)
+        if df_lang.empty:
+            return None
+        df_topics = self.store.select('topic', year_range)
+        df_repos = self.store.select('repos', year_range)
+        stat_years = self.store.years_in('language', year_range)
+        return {
+            'top_lang_stars': df_lang.groupby('language')['stars'].sum().idxmax(),
+            'top_lang_forks': df_lang.groupby('language')['forks'].sum().idxmax(),
+            'top_topic_stars': df_topics.groupby('topic')['stars'].sum().idxmax(),
+            'top_topic_forks': df_topics.groupby('topic')['forks'].sum().idxmax(),
+            'repositories': len(df_repos),
+            'languages': df_lang['language'].nunique(),
+            'stars': df_repos['stars'].sum(),
+            'forks': df_repos['forks'].sum(),
+            'min_year': min(stat_years),
+            'max_year': max(stat_years),
+        }
+
+    def entity_totals(self, entity, year_range, metric):
+        # Totals per entity, largest first (ties in alphabetical order)
+        df = self._stats(entity, year_range)
+        return df.groupby(entity)[metric].sum().sort_values(ascending=False, kind='stable')
+
+    def yearly(self, entity, year_range, metric, languages=None, top_n=None):
+        df = self._stats(entity, year_range, languages)
+        df_yearly = df.groupby(['year', entity])[metric].sum().reset_index()
+
+        if top_n is not None:
+            top = df_yearly.groupby(entity)[metric].sum().nlargest(top_n).index
+            df_yearly = df_yearly[df_yearly[entity].isin(top)].reset_index(drop=True)
+
+        # Stats are stored sparse, zeros are filled in for the selected entities only
+        # (every selected language, also those without activity in the range)
+        entities = languages if entity == 'language' and languages is not None and top_n is None else None
+        return densify(df_yearly, entity, self.store.years_in(entity, year_range), entities, metrics=(metric,))
+
+    def ranks(self, entity, year_range, metric, languages=None, top_n=None):
+        df = self.yearly(entity, year_range, metric, languages, top_n)
+        # Calculate rank for each year - rank 1 = highest stars/forks
+        df['rank'] = df.groupby('year')[metric].rank(method='dense', ascending=False).astype(int)
+        return df
+
+    def percentages(self, entity, year_range, metric, languages=None, top_n=None):
+        df = self.yearly(entity, year_range, metric, languages, top_n)
+        year_totals = df.groupby('year')[metric].sum().reset_index()
+        year_totals.columns = ['year', 'total']
+        df = df.merge(year_totals, on='year')
+        df['percentage'] = (df[metric] / df['total']) * 100
+        return df
+
+    def cumulative(self, entity, year_range, metric, languages=None, top_n=None):
+        df = self.yearly(entity, year_range, metric, languages, top_n)
+        df['cumulative'] = df.groupby(entity)[metric].cumsum()
+        return df
+
+    def repo_years(self, year_range, languages):
+        return sorted(self._repos(year_range, languages)['selected_year'].unique(), reverse=True)
+
+    def top_repos(self, year_range, languages, year, metric, n=20):
+        df = self._repos(year_range, languages)
+        df_top = df[df['selected_year'] == year].nlargest(n, metric)
+        df_top['language'] = df_top['language'].cat.remove_unused_categories()
+        return df_top.drop(columns='repo_id')
+
+    def histogram(self, metric, year_range, languages):
+        # Repositories per log bin of stars/forks, summed from the precomputed counts
+        check_metric(metric)
+        return histogram_frame(sum_histograms(self.store.select('histograms', year_range), metric, languages))
+
+    def topic_vocabulary(self):
+        # Topic names indexed by topic id
+        return self.repo_tables['topics']['topic'].tolist()
+
+    def repo_topics(self, year_range):
+        # (repo, year) rows with the topic ids of the repo
+        df = self.store.select('repos', year_range)[['repo_id', 'selected_year', 'stars', 'forks']].rename(columns={'selected_year': 'year'})
+        return df.merge(self.repo_tables['repos'][['repo_id', 'topic_ids']], on='repo_id')
+
+    def rows(self, dataset, year_range, languages):
+        if dataset == 'Repositories':
+            df = self._repos(year_range, languages)
+            data = df.drop(columns='repo_id')
+            data['topics'] = topic_names(self.repo_tables, df['repo_id'])
+            return data
+        # Zero rows filled in again for the selected languages / every topic of the dataset
+        entity = 'language' if dataset == 'Language Trends' else 'topic'
+        entities = self.store.frames[entity][entity].unique()
+        if entity == 'language':
+            entities = [language for language in entities if language in set(languages)]
+        return trend_rows(self._stats(entity, year_range), entity, self.store.years_in(entity, year_range), entities)
+
+
+def trend_rows(df, entity, years, entities):
+    # Data tab rows of a trend dataset: the sparse rows densified over the years for the
+    # given entities, by entity then year like the dense stats files
+    df = densify(df, entity, years, entities)
+    return df.sort_values([entity, 'year'], kind='stable')[['year', *METRICS, entity]].reset_index(drop=True)
+
+
+# SQL backend
+
+STATS_TABLES = {'language': 'lang_stats', 'topic': 'topic_stats'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lang_stats (ref_topic TEXT, year INTEGER, stars INTEGER, forks INTEGER, language TEXT);
+CREATE TABLE IF NOT EXISTS topic_stats (ref_topic TEXT, year INTEGER, stars INTEGER, forks INTEGER, topic TEXT);
+CREATE TABLE IF NOT EXISTS repo_years (ref_topic TEXT, year INTEGER, repo_id INTEGER, stars INTEGER, forks INTEGER);
+CREATE TABLE IF NOT EXISTS dim_repos (ref_topic TEXT, repo_id INTEGER, name TEXT, created TEXT, language_id INTEGER, topic_ids TEXT);
+CREATE TABLE IF NOT EXISTS dim_languages (ref_topic TEXT, language_id INTEGER, language TEXT);
+CREATE TABLE IF NOT EXISTS dim_topics (ref_topic TEXT, topic_id INTEGER, topic TEXT);
+CREATE TABLE IF NOT EXISTS stat_years (ref_topic TEXT, dataset TEXT, year INTEGER);
+CREATE TABLE IF NOT EXISTS histograms (ref_topic TEXT, year INTEGER, language TEXT, metric TEXT, bin INTEGER, count INTEGER);
+CREATE INDEX IF NOT EXISTS lang_stats_idx ON lang_stats (ref_topic, year, language);
+CREATE INDEX IF NOT EXISTS topic_stats_idx ON topic_stats (ref_topic, year, topic);
+CREATE INDEX IF NOT EXISTS repo_years_idx ON repo_years (ref_topic, year, repo_id);
+CREATE INDEX IF NOT EXISTS histograms_idx ON histograms (ref_topic, metric, year, language);
+CREATE UNIQUE INDEX IF NOT EXISTS dim_repos_idx ON dim_repos (ref_topic, repo_id);
+CREATE UNIQUE INDEX IF NOT EXISTS dim_languages_idx ON dim_languages (ref_topic, language_id);
+CREATE UNIQUE INDEX IF NOT EXISTS dim_topics_idx ON dim_topics (ref_topic, topic_id);
+"""
+
+
+def build_database(db_path, topics, data_dir=DATA_DIR):
+
+    # Built in a copy (rows of the other topics are kept), swapped in once complete
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(db_path):
+        shutil.copyfile(db_path, tmp_path)
+    elif os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript(SCHEMA)
+
+    for topic in topics:
+        # Replace the rows of the topic
+        for table in ('lang_stats', 'topic_stats', 'repo_years', 'histograms', 'dim_repos', 'dim_languages', 'dim_topics', 'stat_years'):
+            conn.execute(f"DELETE FROM {table} WHERE ref_topic = ?", (topic,))
+
+        datasets = {'lang_stats': 'languages', 'topic_stats': 'topics', 'repo_years': 'repo_years', 'histograms': 'histograms'}
+        for table, dataset in datasets.items():
+            if not list_years(data_dir, topic, dataset):
+                print(f"Skipping {dataset} for {topic}: no partitions")
+                continue
+            df = load_partitioned(data_dir, topic, dataset)
+            df.insert(0, 'ref_topic', topic)
+            df.to_sql(table, conn, if_exists='append', index=False)
+
+        # Year axis of the sparse stats
+        for dataset in STATS_DATASETS.values():
+            conn.executemany(
+                "INSERT INTO stat_years VALUES (?, ?, ?)",
+                [(topic, dataset, year) for year in list_years(data_dir, topic, dataset)]
+            )
+
+        try:
+            # Raw topics merged with the normalization mapping of the topic, as in the shared store
+            repo_tables = canonical_tables(load_tables(data_dir, topic, tables=('languages', 'topics', 'repos')), load_topic_mapping(data_dir, topic))
+        except FileNotFoundError:
+            print(f"Skipping repository tables for {topic}: not found")
+            continue
+        for table, df in (('dim_languages', repo_tables['languages']), ('dim_topics', repo_tables['topics']), ('dim_repos', repo_tables['repos'])):
+            df = df.copy()
+            df.insert(0, 'ref_topic', topic)
+            df.to_sql(table, conn, if_exists='append', index=False)
+
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    os.replace(tmp_path, db_path)
+
+
+def check_metric(metric, entity='language'):
+    # Column names are interpolated in the SQL, only known ones are allowed
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown entity '{entity}', expected one of {ENTITIES}")
+
+
+_connections = threading.local()
+
+
+def _connect(db_path, version):
+    # One read-only connection per thread (Streamlit runs sessions in threads), reopened on a
+    # new version: a connection keeps reading the file it opened, even once it is replaced
+    conns = getattr(_connections, 'conns', None)
+    if conns is None:
+        conns = _connections.conns = {}
+    if db_path in conns and conns[db_path][0] != version:
+        conns.pop(db_path)[1].close()
+    if db_path not in conns:
+        conns[db_path] = (version, sqlite3.connect(f'file:{db_path}?mode=ro', uri=True, check_same_thread=False))
+    return conns[db_path][1]
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_query(db_path, version, sql, params):
+    # version (file mtime) invalidates cached results when the database is rebuilt
+    return pd.read_sql_query(sql, _connect(db_path, version), params=params)
+
+
+_db_watchers = {}
+_db_warmups = {}
+_db_lock = threading.Lock()
+
+
+def watch_database(db_path, interval):
+    # Runs the registered warmups once on each new version of the database
+    version = os.path.getmtime(db_path)
+    while True:
+        time.sleep(interval)
+        try:
+            if os.path.getmtime(db_path) == version:
+                continue
+            version = os.path.getmtime(db_path)
+            with _db_lock:
+                warmups = list(_db_warmups.get(db_path, {}).items())
+            for (topic, name), warmup in warmups:
+                try:
+                    warmup(SqlBackend(db_path, topic))
+                except Exception as e:
+                    # Queries are cached on demand instead
+                    print(f"Error in {name} warmup: {e}")
+            print(f"Reloaded {db_path}: version {version}")
+        except Exception as e:
+            print(f"Error: {e}")
+
+
+class SqlBackend:
+    """Charts computed by parameterized queries on an embedded SQLite database."""
+
+    def __init__(self, db_path, topic, watch_interval=None):
+        self.db_path = os.path.abspath(db_path)
+        self.topic = topic
+        # Checks for a rebuilt database every watch_interval seconds, one watcher per database
+        with _db_lock:
+            if watch_interval and self.db_path not in _db_watchers:
+                _db_watchers[self.db_path] = threading.Thread(target=watch_database, args=(self.db_path, watch_interval), daemon=True)
+                _db_watchers[self.db_path].start()
+
+    def version(self):
+        return str(os.path.getmtime(self.db_path))
+
+    def on_reload(self, name, warmup):
+        # warmup(backend) runs in the watcher thread on each rebuilt database, with a backend on it.
+        # Registered again on every rerun, the name keeps a single entry.
+        with _db_lock:
+            _db_warmups.setdefault(self.db_path, {})[(self.topic, name)] = warmup
+
+    def _query(self, sql, params=()):
+        version = os.path.getmtime(self.db_path)
+        return _cached_query(self.db_path, version, sql, tuple(params)).copy()
+
+    def _filters(self, year_range, languages=None, column='language'):
+        where = "ref_topic = ? AND year BETWEEN ? AND ?"
+        params = [self.topic, int(year_range[0]), int(year_range[1])]
+        if languages is not None:
+            where += f" AND {column} IN ({', '.join('?' * len(languages))})"
+            params += list(languages)
+        return where, params
+
+    def languages(self):
+        df = self._query("SELECT language FROM dim_languages WHERE ref_topic = ? ORDER BY language", [self.topic])
+        return df['language'].tolist()
+
+    def years(self):
+        df = self._query("SELECT year FROM stat_years WHERE ref_topic = ? AND dataset = 'languages' ORDER BY year", [self.topic])
+        return df['year'].tolist()
+
+    def overview(self, year_range):
+        where, params = self._filters(year_range)
+        df_lang = self._query(f"SELECT COUNT(DISTINCT language) AS languages FROM lang_stats WHERE {where}", params)
+        if df_lang['languages'].iloc[0] == 0:
+            return None
+        df_years = self._query(f"SELECT MIN(year) AS min_year, MAX(year) AS max_year FROM stat_years WHERE dataset = 'languages' AND {where}", params)
+        df_repos = self._query(f"SELECT COUNT(*) AS repositories, SUM(stars) AS stars, SUM(forks) AS forks FROM repo_years WHERE {where}", params)
+
+        return {
+            'top_lang_stars': self.entity_totals('language', year_range, 'stars').index[0],
+            'top_lang_forks': self.entity_totals('language', year_range, 'forks').index[0],
+            'top_topic_stars': self.entity_totals('topic', year_range, 'stars').index[0],
+            'top_topic_forks': self.entity_totals('topic', year_range, 'forks').index[0],
+            'repositories': int(df_repos['repositories'].iloc[0]),
+            'languages': int(df_lang['languages'].iloc[0]),
+            'stars': int(df_repos['stars'].fillna(0).iloc[0]),
+            'forks': int(df_repos['forks'].fillna(0).iloc[0]),
+            'min_year': int(df_years['min_year'].iloc[0]),
+            'max_year': int(df_years['max_year'].iloc[0]),
+        }
+
+    def entity_totals(self, entity, year_range, metric):
+        check_metric(metric, entity)
+        where, params = self._filters(year_range)
+        df = self._query(
+            f"SELECT {entity}, SUM({metric}) AS {metric} FROM {STATS_TABLES[entity]} WHERE {where} "
+            f"GROUP BY {entity} ORDER BY {metric} DESC, {entity}",
+            params
+        )
+        return df.set_index(entity)[metric]
+
+    def _yearly_sql(self, entity, year_range, metric, languages=None, top_n=None):
+        # CTE with the yearly sums, optionally restricted to the top N entities over the range,
+        # densified over the year axis (stats are stored sparse) for the selected entities only
+        check_metric(metric, entity)
+        table = STATS_TABLES[entity]
+        where, params = self._filters(year_range, languages)
+
+        sql = (
+            f"WITH yearly AS (SELECT year, {entity}, SUM({metric}) AS {metric} FROM {table} "
+            f"WHERE {where} GROUP BY year, {entity})"
+        )
+        if top_n is not None:
+            sql += (
+                f", top AS (SELECT {entity} FROM yearly GROUP BY {entity} "
+                f"ORDER BY SUM({metric}) DESC, {entity} LIMIT ?)"
+                f", sparse AS (SELECT * FROM yearly WHERE {entity} IN (SELECT {entity} FROM top))"
+            )
+            params = params + [int(top_n)]
+        else:
+            sql += ", sparse AS (SELECT * FROM yearly)"
+
+        # Every selected language, also those without activity in the range, else the entities of the rows
+        entity_params = []
+        if entity == 'language' and languages is not None and top_n is None:
+            entities = ' UNION ALL '.join([f"SELECT ? AS {entity}"] * len(languages)) or f"SELECT NULL AS {entity} WHERE 0"
+            entity_params = list(languages)
+        else:
+            entities = f"SELECT DISTINCT {entity} FROM sparse"
+
+        where_years, params_years = self._filters(year_range)
+        sql += (
+            f", axis AS (SELECT year FROM stat_years WHERE dataset = ? AND {where_years})"
+            f", selected AS (SELECT a.year, e.{entity}, COALESCE(s.{metric}, 0) AS {metric} "
+            f"FROM axis a CROSS JOIN ({entities}) e "
+            f"LEFT JOIN sparse s ON s.year = a.year AND s.{entity} = e.{entity})"
+        )
+        return sql, params + [STATS_DATASETS[entity]] + params_years + entity_params
+
+    def yearly(self, entity, year_range, metric, languages=None, top_n=None):
+        sql, params = self._yearly_sql(entity, year_range, metric, languages, top_n)
+        return self._query(sql + f" SELECT year, {entity}, {metric} FROM selected ORDER BY year, {entity}", params)
+
+    def ranks(self, entity, year_range, metric, languages=None, top_n=None):
+        sql, params = self._yearly_sql(entity, year_range, metric, languages, top_n)
+        return self._query(
+            sql + f" SELECT year, {entity}, {metric}, "
+            f"DENSE_RANK() OVER (PARTITION BY year ORDER BY {metric} DESC) AS rank "
+            f"FROM selected ORDER BY year, {entity}",
+            params
+        )
+
+    def percentages(self, entity, year_range, metric, languages=None, top_n=None):
+        sql, params = self._yearly_sql(entity, year_range, metric, languages, top_n)
+        return self._query(
+            sql + f" SELECT year, {entity}, {metric}, SUM({metric}) OVER (PARTITION BY year) AS total, "
+            f"100.0 * {metric} / SUM({metric}) OVER (PARTITION BY year) AS percentage "
+            f"FROM selected ORDER BY year, {entity}",
+            params
+        )
+
+    def cumulative(self, entity, year_range, metric, languages=None, top_n=None):
+        sql, params = self._yearly_sql(entity, year_range, metric, languages, top_n)
+        return self._query(
+            sql + f" SELECT year, {entity}, {metric}, "
+            f"SUM({metric}) OVER (PARTITION BY {entity} ORDER BY year ROWS UNBOUNDED PRECEDING) AS cumulative "
+            f"FROM selected ORDER BY year, {entity}",
+            params
+        )
+
+    def _repos_sql(self, year_range, languages):
+        params = [self.topic, int(year_range[0]), int(year_range[1])]
+        sql = (
+            "SELECT f.repo_id, r.name, f.stars, r.created, f.forks, l.language, f.year AS selected_year, r.topic_ids "
+            "FROM (SELECT * FROM repo_years WHERE ref_topic = ? AND year BETWEEN ? AND ?) f "
+            "JOIN dim_repos r ON r.ref_topic = f.ref_topic AND r.repo_id = f.repo_id "
+            "JOIN dim_languages l ON l.ref_topic = f.ref_topic AND l.language_id = r.language_id "
+        )
+        if languages is not None:
+            sql += f"WHERE l.language IN ({', '.join('?' * len(languages))}) "
+            params += list(languages)
+        return sql, params
+
+    def repo_years(self, year_range, languages):
+        sql, params = self._repos_sql(year_range, languages)
+        df = self._query(f"SELECT DISTINCT selected_year FROM ({sql}) ORDER BY selected_year DESC", params)
+        return df['selected_year'].tolist()
+
+    def top_repos(self, year_range, languages, year, metric, n=20):
+        # year is None when the selection has no repositories (empty "Select Year"), no rows then
+        check_metric(metric)
+        sql, params = self._repos_sql(year_range, languages)
+        return self._query(
+            f"SELECT * FROM ({sql}) WHERE selected_year = ? ORDER BY {metric} DESC, name LIMIT ?",
+            params + [None if year is None else int(year), int(n)]
+        ).drop(columns=['repo_id', 'topic_ids'])
+
+    def histogram(self, metric, year_range, languages):
+        check_metric(metric)
+        where, params = self._filters(year_range, languages)
+        df = self._query(f"SELECT bin, SUM(count) AS count FROM histograms WHERE metric = ? AND {where} GROUP BY bin", [metric] + params)
+        counts = np.zeros(N_BINS, dtype=np.int64)
+        counts[df['bin'].to_numpy(dtype=np.int64)] = df['count'].to_numpy(dtype=np.int64)
+        return histogram_frame(counts)
+
+    def topic_vocabulary(self):
+        df = self._query("SELECT topic FROM dim_topics WHERE ref_topic = ? ORDER BY topic_id", [self.topic])
+        return df['topic'].tolist()
+
+    def repo_topics(self, year_range):
+        return self._query(
+            "SELECT f.repo_id, f.year, f.stars, f.forks, r.topic_ids "
+            "FROM repo_years f JOIN dim_repos r ON r.ref_topic = f.ref_topic AND r.repo_id = f.repo_id "
+            "WHERE f.ref_topic = ? AND f.year BETWEEN ? AND ? ORDER BY f.year, f.repo_id",
+            [self.topic, int(year_range[0]), int(year_range[1])]
+        )
+
+    def rows(self, dataset, year_range, languages):
+        if dataset == 'Repositories':
+            sql, params = self._repos_sql(year_range, languages)
+            df = self._query(sql + "ORDER BY f.year, f.repo_id", params)
+            all_topics = self.topic_vocabulary()
+            df['topics'] = [[all_topics[int(i)] for i in ids.split()] if ids else [] for ids in df['topic_ids'].fillna('')]
+            return df.drop(columns=['repo_id', 'topic_ids'])
+
+        entity = 'language' if dataset == 'Language Trends' else 'topic'
+        table = STATS_TABLES[entity]
+        where, params = self._filters(year_range, languages if entity == 'language' else None)
+        df = self._query(f"SELECT year, stars, forks, {entity} FROM {table} WHERE {where}", params)
+
+        # Zero rows filled in again for the selected languages / every topic of the dataset
+        sql_entities, params_entities = f"SELECT DISTINCT {entity} FROM {table} WHERE ref_topic = ?", [self.topic]
+        if entity == 'language':
+            sql_entities += f" AND language IN ({', '.join('?' * len(languages))})"
+            params_entities += list(languages)
+        entities = self._query(sql_entities, params_entities)[entity]
+        where_years, params_years = self._filters(year_range)
+        years = self._query(f"SELECT year FROM stat_years WHERE dataset = ? AND {where_years} ORDER BY year", [STATS_DATASETS[entity]] + params_years)['year']
+        return trend_rows(df, entity, years, entities)
+
+
+def open_backend(data_dir, topic, watch_interval=None):
+    # watch_interval: seconds between checks for a new dataset version (or a rebuilt database)
+    db_path = os.environ.get('BIO_LANG_RACE_DB')
+    if db_path:
+        return SqlBackend(db_path, topic, watch_interval)
+    return PandasBackend(data_dir, topic, watch_interval)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the SQLite database used by the SQL backend")
+    parser.add_argument('command', choices=['build'])
+    parser.add_argument('topics', nargs='*', help="Reference topics (default: all partitioned topics)")
+    parser.add_argument('--db', default=os.path.join(DATA_DIR, 'bio_lang_race.sqlite'))
+    args = parser.parse_args()
+
+    topics = args.topics or list_topics(DATA_DIR)
+    build_database(args.db, topics)
+    print(f"Built {args.db} with topics: {', '.join(topics)}")
@@ -0,0 +1,159 @@
+"""Collect repositories from the GitHub search API.
+
+Results are streamed to an append-only JSONL log as each yearly query
+completes, and a small checkpoint file records which queries are done and
+the log size at that point. An interrupted collection resumes from the last
+completed query. A failed request raises once the completed queries are
+checkpointed, so that nothing gets built from a partial log.
+
+Only the collection loop runs in constant memory (one query page at a
+time). The log is the only denormalized copy of the repos, the repository
+tables are built from it (see tables.py). The aggregation steps of the collection notebook load the whole log
+with `read_repos_log`.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+
+def search_github_repos(keywords, topic, min_stars, max_stars, start_date, end_date, token=None):
+
+    # Build the query
+    keywords_query = ' '.join(keywords)
+    stars_query = f"stars:{min_stars}..{max_stars}"
+    date_query = f"pushed:{start_date}..{end_date}"
+    topic_query = f"topic:{topic}"
+
+    query = f"{keywords_query} {stars_query} {date_query} {topic_query} "
+
+    # GitHub API endpoint
+    url = "https://api.github.com/search/repositories"
+
+    # Headers
+    headers = {
+        "Accept": "application/vnd.github.v3+json"
+    }
+
+    if token:
+        headers["Authorization"] = f"token {token}"
+
+    # Parameters
+    params = {
+        "q": query,
+        "sort": "stars",
+        "order": "desc",
+        "per_page": 100  # Max results per page
+    }
+
+    # Errors are raised so that the caller can stop and resume later
+    response = requests.get(url, headers=headers, params=params)
+    response.raise_for_status()
+
+    data = response.json()
+
+    # Extract repository information
+    repos = []
+    for item in data.get('items', []):
+        repo_info = {
+            'name': item['full_name'],
+            'stars': int(item['stargazers_count']),
+            'created': datetime.strptime(item['created_at'], '%Y-%m-%dT%H:%M:%SZ').strftime('%Y-%m-%d'),
+            'forks': int(item['forks_count']),
+            'topics': item['topics'],
+            'language': item['language'],
+            #'languages_url': item['languages_url'],
+            'selected_year': int(start_date.split('-')[0])
+        }
+        repos.append(repo_info)
+
+    return repos, data.get('total_count', 0)
+
+
+def checkpoint_path_for(log_path):
+    return os.path.splitext(log_path)[0] + '.checkpoint.json'
+
+
+def load_checkpoint(checkpoint_path):
+    if not os.path.exists(checkpoint_path):
+        return {'completed': [], 'offset': 0, 'totals': {}}
+    with open(checkpoint_path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint, checkpoint_path):
+    # Write then rename, so a crash never leaves a half written checkpoint
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def collect_repos(topic, list_years, log_path, keywords='', min_stars=10, max_stars=5000, token=None, fresh=False):
+
+    checkpoint_path = checkpoint_path_for(log_path)
+
+    if fresh or not os.path.exists(log_path):
+        checkpoint = {'completed': [], 'offset': 0, 'totals': {}}
+        open(log_path, 'w').close()
+    else:
+        checkpoint = load_checkpoint(checkpoint_path)
+
+    # Drop anything appended after the last checkpoint (interrupted query)
+    with open(log_path, 'r+b') as f:
+        f.truncate(checkpoint['offset'])
+
+    with open(log_path, 'ab') as log:
+        for year in list_years:
+
+            start_date = str(year)+'-01-01'
+            end_date = str(year)+'-12-31'
+            query_key = f"{topic}:{start_date}..{end_date}"
+
+            if query_key in checkpoint['completed']:
+                print(f"Skipping {query_key} (already collected)")
+                continue
+
+            print(f"Searching for repositories")
+            print(f"Stars range: {min_stars} - {max_stars}")
+            print(f"Date range: {start_date} to {end_date}")
+            print(f"Topic: {topic}")
+
+            try:
+                repos, total = search_github_repos(
+                    keywords=keywords,
+                    topic=topic,
+                    min_stars=min_stars,
+                    max_stars=max_stars,
+                    start_date=start_date,
+                    end_date=end_date,
+                    token=token
+                )
+            except requests.exceptions.RequestException as e:
+                # Completed queries are already checkpointed
+                raise RuntimeError(f"Collection stopped at {query_key}, rerun to resume from there") from e
+
+            print(f"Total: {total}")
+
+            for repo in repos:
+                log.write((json.dumps(repo) + '\n').encode('utf-8'))
+            log.flush()
+            os.fsync(log.fileno())
+
+            checkpoint['completed'].append(query_key)
+            checkpoint['offset'] = log.tell()
+            checkpoint['totals'][query_key] = total
+            save_checkpoint(checkpoint, checkpoint_path)
+
+    return checkpoint['totals']
+
+
+def read_repos_log(log_path, chunksize=None):
+    # Whole log as a DataFrame, or an iterator of DataFrames when chunksize is set
+    return pd.read_json(log_path, lines=True, chunksize=chunksize, dtype={'selected_year': 'int64'})
+
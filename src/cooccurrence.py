@@ -0,0 +1,121 @@
+"""Sparse topic co-occurrence.
+
+Repositories and their topics form a sparse repo x topic incidence matrix X
+(built straight from the integer `topic_ids` of the repository dimension).
+The topic x topic co-occurrence counts of a set of repos are then the sparse
+product X.T @ X restricted to those rows, computed once per year. Nothing is
+quadratic in the number of topics, so this stays fast for large
+vocabularies.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def incidence_matrix(topic_ids, n_topics):
+    # Space separated topic id strings (one per repo) -> CSR repo x topic matrix
+    rows = [np.array(ids.split(), dtype=np.int32) if ids else np.empty(0, dtype=np.int32) for ids in topic_ids]
+    lengths = np.array([len(row) for row in rows], dtype=np.int64)
+
+    indptr = np.concatenate([[0], np.cumsum(lengths)])
+    indices = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.float64)
+
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_topics))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix
+
+
+def cooccurrence_by_year(df_repo_topics, n_topics, weight=None):
+    # {year: topic x topic co-occurrence}, diagonal = number of repos (or weight) per topic.
+    # df_repo_topics has one row per (repo, year) with its topic_ids.
+    incidence = incidence_matrix(df_repo_topics['topic_ids'].fillna(''), n_topics)
+    years = df_repo_topics['year'].to_numpy()
+
+    counts = {}
+    for year in np.unique(years):
+        rows = np.flatnonzero(years == year)
+        x = incidence[rows]
+        if weight is not None:
+            x = sparse.diags(df_repo_topics[weight].to_numpy(dtype=np.float64)[rows]) @ x
+            counts[int(year)] = (x.T @ incidence[rows]).tocsr()
+        else:
+            counts[int(year)] = (x.T @ x).tocsr()
+
+    return counts
+
+
+def combine_years(counts, years=None):
+    # Co-occurrence summed over several years
+    selected = [counts[year] for year in (years if years is not None else counts) if year in counts]
+    if not selected:
+        return None
+    total = selected[0].copy()
+    for matrix in selected[1:]:
+        total = total + matrix
+    return total.tocsr()
+
+
+def related_topics(cooc, topic_names, topic, n=15, exclude=()):
+    # Topics appearing most often with `topic`, with an association score
+    # (co-occurrences / sqrt(frequency_a * frequency_b), 1 = always together)
+    index = {name: i for i, name in enumerate(topic_names)}
+    if topic not in index:
+        return pd.DataFrame(columns=['topic', 'repositories', 'score'])
+
+    i = index[topic]
+    frequency = cooc.diagonal()
+    row = cooc.getrow(i)
+
+    others = row.indices
+    values = row.data
+    keep = (others != i) & ~np.isin(others, [index[t] for t in exclude if t in index])
+    others, values = others[keep], values[keep]
+
+    score = values / np.sqrt(frequency[i] * frequency[others])
+    df = pd.DataFrame({'topic': np.asarray(topic_names)[others], 'repositories': values, 'score': score})
+    return df.sort_values(['repositories', 'score'], ascending=False).head(n).reset_index(drop=True)
+
+
+def top_network(cooc, topic_names, n_nodes=40, min_weight=2, exclude=()):
+    # Nodes = most frequent topics, edges = their co-occurrences above min_weight
+    topic_names = np.asarray(topic_names)
+    frequency = cooc.diagonal().astype(float)
+    frequency[np.isin(topic_names, list(exclude))] = -1
+
+    nodes = np.argsort(-frequency, kind='stable')[:n_nodes]
+    nodes = nodes[frequency[nodes] > 0]
+
+    sub = sparse.triu(cooc[nodes][:, nodes], k=1).tocoo()
+    keep = sub.data >= min_weight
+
+    df_nodes = pd.DataFrame({'topic': topic_names[nodes], 'repositories': frequency[nodes]})
+    df_edges = pd.DataFrame({'source': sub.row[keep], 'target': sub.col[keep], 'weight': sub.data[keep]})
+    return df_nodes, df_edges
+
+
+def spring_layout(n_nodes, df_edges, iterations=100, seed=0):
+    # Small force-directed layout (Fruchterman-Reingold) for the network view
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1, 1, size=(n_nodes, 2))
+    if n_nodes < 2:
+        return pos
+
+    k = 1 / np.sqrt(n_nodes)
+    adjacency = np.zeros((n_nodes, n_nodes))
+    adjacency[df_edges['source'], df_edges['target']] = np.log1p(df_edges['weight'])
+    adjacency = adjacency + adjacency.T
+
+    temperature = 0.1
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 0.01)
+        force = (k ** 2 / distance ** 2 - adjacency * distance / k)
+        displacement = (delta * force[:, :, None]).sum(axis=1)
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 0.01)
+        pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature *= 0.97
+
+    return pos
@@ -0,0 +1,215 @@
+"""Enrich collected repositories with GitHub GraphQL metadata.
+
+The search API only returns the primary `language` of each repository. This
+module fetches the byte-level language breakdown (plus a few metadata fields)
+for many repositories per request, using one aliased `repository(...)` field
+per repo in a single GraphQL query. Batches run concurrently while staying
+under the GraphQL rate limit reported by the API.
+
+GraphQL reports failures (RATE_LIMITED, timeouts) as HTTP 200 with an
+`errors` list. Batches without data are retried, then failed; a repository
+is only skipped when the API reports it NOT_FOUND. The names of the repos
+of failed batches are returned so that no partial breakdown gets written.
+Results are keyed by the `repo_id` of the repository dimension (tables.py).
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import pandas as pd
+import requests
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+REPO_FIELDS = """
+    nameWithOwner
+    pushedAt
+    isArchived
+    diskUsage
+    licenseInfo { spdxId }
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+      totalSize
+      edges { size node { name } }
+    }
+"""
+
+
+class RateLimit:
+    """Rate limit budget shared by the worker threads."""
+
+    def __init__(self, min_remaining=100):
+        self.min_remaining = min_remaining
+        self.remaining = None
+        self.reset_at = None
+        self.lock = threading.Lock()
+
+    def update(self, rate_limit):
+        if not rate_limit:
+            return
+        with self.lock:
+            if self.remaining is None or rate_limit['remaining'] < self.remaining:
+                self.remaining = rate_limit['remaining']
+                self.reset_at = datetime.strptime(rate_limit['resetAt'], '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+
+    def wait(self):
+        # Block until the budget is reset when close to exhaustion
+        with self.lock:
+            if self.remaining is None or self.remaining > self.min_remaining:
+                return
+            delay = (self.reset_at - datetime.now(timezone.utc)).total_seconds() + 1
+            print(f"Rate limit nearly exhausted ({self.remaining} left), waiting {delay:.0f}s")
+            if delay > 0:
+                time.sleep(delay)
+            self.remaining = None
+
+
+class GraphQLError(Exception):
+    """Query-level error reported by the GraphQL API (HTTP 200 with `errors`)."""
+
+
+def error_message(errors):
+    return '; '.join(error.get('type') or error.get('message', str(error)) for error in errors) or "response without data"
+
+
+def build_languages_query(names):
+    aliases = []
+    for i, name in enumerate(names):
+        owner, repo = name.split('/', 1)
+        aliases.append(f"  r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{{REPO_FIELDS}  }}")
+
+    return "query {\n" + "\n".join(aliases) + "\n  rateLimit { cost remaining resetAt }\n}"
+
+
+def fetch_languages_batch(repos, token=None, url=GRAPHQL_URL, max_retries=3):
+    # repos: (repo_id, name) pairs. Only repositories reported NOT_FOUND are skipped,
+    # any other error fails the whole batch.
+
+    headers = {
+        "Accept": "application/json"
+    }
+
+    if token:
+        headers["Authorization"] = f"bearer {token}"
+
+    query = build_languages_query([name for _, name in repos])
+
+    for attempt in range(max_retries + 1):
+        response = requests.post(url, json={'query': query}, headers=headers, timeout=60)
+
+        # Secondary rate limits and transient server errors are retried
+        if response.status_code in (403, 429, 502, 503) and attempt < max_retries:
+            delay = int(response.headers.get('Retry-After', 10 * 2 ** attempt))
+            print(f"Retrying batch in {delay}s (HTTP {response.status_code})")
+            time.sleep(delay)
+            continue
+
+        response.raise_for_status()
+        payload = response.json()
+        errors = payload.get('errors') or []
+
+        # Query-level failures (RATE_LIMITED, timeouts) come back as HTTP 200 without data
+        if payload.get('data') is None:
+            if attempt < max_retries and all(error.get('type') in (None, 'RATE_LIMITED') for error in errors):
+                delay = int(response.headers.get('Retry-After', 60 * 2 ** attempt))
+                print(f"Retrying batch in {delay}s ({error_message(errors)})")
+                time.sleep(delay)
+                continue
+            raise GraphQLError(error_message(errors))
+        break
+
+    data = payload['data']
+    not_found = {error['path'][0] for error in errors if error.get('type') == 'NOT_FOUND' and error.get('path')}
+    other_errors = [error for error in errors if error.get('type') != 'NOT_FOUND']
+    if other_errors:
+        raise GraphQLError(error_message(other_errors))
+
+    languages = []
+    metadata = []
+    for i, (repo_id, name) in enumerate(repos):
+        repo = data.get(f'r{i}')
+        if repo is None:
+            if f'r{i}' in not_found:
+                # Renamed, deleted or private repository
+                continue
+            raise GraphQLError(f"No data for {name}")
+
+        for edge in repo['languages']['edges']:
+            languages.append({
+                'repo_id': repo_id,
+                'language': edge['node']['name'],
+                'bytes': int(edge['size'])
+            })
+
+        metadata.append({
+            'repo_id': repo_id,
+            'pushed_at': repo['pushedAt'][:10] if repo['pushedAt'] else None,
+            'archived': repo['isArchived'],
+            'disk_usage_kb': repo['diskUsage'],
+            'license': (repo['licenseInfo'] or {}).get('spdxId'),
+            'total_bytes': int(repo['languages']['totalSize'])
+        })
+
+    return languages, metadata, data.get('rateLimit')
+
+
+def enrich_repos(df_dim_repos, token=None, url=GRAPHQL_URL, batch_size=50, max_workers=4, min_remaining=100):
+    # df_dim_repos: repository dimension (repo_id, name). Returns the repo x language breakdown
+    # and the metadata keyed by repo_id, and the names of the repos of failed batches.
+
+    repos = list(df_dim_repos[['repo_id', 'name']].drop_duplicates('repo_id').itertuples(index=False, name=None))
+    batches = [repos[i:i + batch_size] for i in range(0, len(repos), batch_size)]
+    rate_limit = RateLimit(min_remaining=min_remaining)
+
+    def run_batch(batch):
+        rate_limit.wait()
+        languages, metadata, rate = fetch_languages_batch(batch, token=token, url=url)
+        rate_limit.update(rate)
+        return languages, metadata
+
+    all_languages = []
+    all_metadata = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            try:
+                languages, metadata = future.result()
+            except (requests.exceptions.RequestException, GraphQLError) as e:
+                print(f"Error: {e}")
+                failed.extend(name for _, name in futures[future])
+                continue
+            all_languages.extend(languages)
+            all_metadata.extend(metadata)
+
+    df_languages = pd.DataFrame(all_languages, columns=['repo_id', 'language', 'bytes'])
+    df_languages = df_languages.astype({'repo_id': 'int32', 'bytes': 'int64'}).sort_values(['repo_id', 'bytes'], ascending=[True, False]).reset_index(drop=True)
+    df_metadata = pd.DataFrame(all_metadata, columns=['repo_id', 'pushed_at', 'archived', 'disk_usage_kb', 'license', 'total_bytes'])
+    df_metadata = df_metadata.astype({'repo_id': 'int32'}).sort_values('repo_id').reset_index(drop=True)
+
+    return df_languages, df_metadata, sorted(failed)
+
+
+def language_stats_by_bytes(df_repos, df_repo_languages):
+    # Split the stars/forks of each repo across its languages, proportionally to code bytes.
+    # df_repos: (repo, year) rows of repos_view. Repos without any code (or reported
+    # NOT_FOUND) keep all their stars/forks on their primary language.
+    shares = df_repo_languages[df_repo_languages['bytes'] > 0].copy()
+    shares['share'] = shares['bytes'] / shares.groupby('repo_id')['bytes'].transform('sum')
+
+    missing = df_repos.loc[~df_repos['repo_id'].isin(shares['repo_id']), ['repo_id', 'language']].drop_duplicates('repo_id')
+    missing['language'] = missing['language'].astype(str)
+    missing['share'] = 1.0
+    shares = pd.concat([shares[['repo_id', 'language', 'share']], missing], ignore_index=True)
+
+    df = df_repos[['repo_id', 'selected_year', 'stars', 'forks']].merge(shares, on='repo_id')
+    df['stars'] = df['stars'] * df['share']
+    df['forks'] = df['forks'] * df['share']
+
+    df_stats = df.groupby(['selected_year', 'language'])[['stars', 'forks']].sum().round().astype('int64').reset_index()
+    df_stats = df_stats.rename(columns={'selected_year': 'year'})
+
+    return df_stats[['year', 'stars', 'forks', 'language']]
@@ -0,0 +1,84 @@
+"""Log-binned star and fork histograms.
+
+The aggregation stage counts repositories per (year, language, metric, bin)
+with logarithmic bins (BINS_PER_DECADE per power of ten, plus a bin for 0)
+and stores the non-zero counts as the `histograms` year partitions. Any
+distribution shown by the dashboard (a year range x a set of languages) is
+then a sum of these small count arrays, the repository rows are not needed.
+
+Usage (writes the histogram partitions of a topic from its repository tables):
+    python histograms.py bioinformatics
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from partitions import list_years, load_partitioned, write_partitioned
+from tables import DATA_DIR, load_tables, repos_view
+
+
+METRICS = ('stars', 'forks')
+
+BINS_PER_DECADE = 4
+DECADES = 6
+
+# Integer lower edges: 0, 1, 2, 4, 6, 10, 18, 32, 57, 100, ... the last bin also holds larger values
+EDGES = np.concatenate([[0], np.ceil(10 ** (np.arange(DECADES * BINS_PER_DECADE + 1) / BINS_PER_DECADE) - 1e-9)]).astype(np.int64)
+N_BINS = len(EDGES) - 1
+
+
+def bin_index(values):
+    bins = np.searchsorted(EDGES, np.asarray(values, dtype=np.int64), side='right') - 1
+    return np.minimum(bins, N_BINS - 1)
+
+
+def bin_labels():
+    labels = []
+    for lower, upper in zip(EDGES[:-1], EDGES[1:] - 1):
+        labels.append(str(lower) if lower == upper else f'{lower}-{upper}')
+    labels[-1] = f'{EDGES[-2]}+'
+    return labels
+
+
+def count_histograms(df_repos, year_column='selected_year', metrics=METRICS):
+    # Long (year, language, metric, bin, count) rows, non-zero counts only
+    parts = []
+    for metric in metrics:
+        part = pd.DataFrame({
+            'year': df_repos[year_column].to_numpy(),
+            'language': df_repos['language'].astype(str).to_numpy(),
+            'metric': metric,
+            'bin': bin_index(df_repos[metric]).astype(np.int8),
+        })
+        parts.append(part.groupby(['year', 'language', 'metric', 'bin']).size().rename('count').reset_index())
+
+    return pd.concat(parts, ignore_index=True).astype({'count': 'int32'})
+
+
+def sum_histograms(df_hist, metric, languages=None):
+    # Count array (N_BINS) of the selected rows
+    mask = (df_hist['metric'] == metric).to_numpy()
+    if languages is not None:
+        mask &= df_hist['language'].isin(languages).to_numpy()
+    return np.bincount(df_hist['bin'].to_numpy()[mask], weights=df_hist['count'].to_numpy()[mask], minlength=N_BINS).astype(np.int64)
+
+
+def histogram_frame(counts):
+    # One row per bin, without the empty bins before the first and after the last count
+    nonzero = np.flatnonzero(counts)
+    if len(nonzero) == 0:
+        return pd.DataFrame(columns=['bin', 'label', 'repositories'])
+    bins = np.arange(nonzero[0], nonzero[-1] + 1)
+    return pd.DataFrame({'bin': bins, 'label': np.asarray(bin_labels())[bins], 'repositories': counts[bins]})
+
+
+if __name__ == '__main__':
+    topic = sys.argv[1] if len(sys.argv) > 1 else 'bioinformatics'
+    repo_tables = load_tables(DATA_DIR, topic, tables=('languages', 'repos'))
+    df_repos = repos_view({**repo_tables, 'repo_years': load_partitioned(DATA_DIR, topic, 'repo_years')})
+
+    df_hist = count_histograms(df_repos)
+    write_partitioned(df_hist, DATA_DIR, topic, 'histograms', years=list_years(DATA_DIR, topic, 'repo_years'))
+    print(f"histograms: {len(df_hist)} non-zero bins for {len(df_repos)} repositories")
@@ -0,0 +1,370 @@
+"""Concurrent-session load test for the Streamlit dashboard.
+
+Launches `app.py` on a local Streamlit server, opens N headless sessions over
+the Streamlit websocket protocol and drives each one through scripted
+interactions (languages, year slider, metric, Data tab). Reports rerun
+latency percentiles, throughput and server RSS for every concurrency level.
+
+Usage:
+    python load_test.py --concurrency 1 5 10 20 --iterations 10
+    python load_test.py --url http://localhost:8501 --pid 12345
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Widgets driven by the scenario, looked up by label in the rendered page
+LANGUAGES_LABEL = "Select Programming Languages"
+YEAR_RANGE_LABEL = "Select Year Range"
+METRIC_LABEL = "Select Metric Type"
+DATASET_LABEL = "Select Dataset to View"
+SORT_COLUMN_LABEL = "Sort by Column"
+SORT_ORDER_LABEL = "Sort Order"
+
+WIDGET_TYPES = {'multiselect', 'slider', 'radio', 'selectbox'}
+
+
+# Server handling
+
+def launch_server(app_path, port):
+    cmd = [
+        sys.executable, '-m', 'streamlit', 'run', app_path,
+        '--server.headless', 'true',
+        '--server.port', str(port),
+        '--server.fileWatcherType', 'none',
+        '--browser.gatherUsageStats', 'false',
+    ]
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_server(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(url + '/_stcore/health', timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Streamlit server at {url} did not become healthy within {timeout}s")
+
+
+def read_rss(pid):
+    # Resident set size of the server process in bytes
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+async def sample_rss(pid, samples, interval=0.2):
+    while True:
+        rss = read_rss(pid)
+        if rss is not None:
+            samples.append(rss)
+        await asyncio.sleep(interval)
+
+
+# Session driving
+
+class Session:
+    """One headless browser session talking to the server websocket."""
+
+    def __init__(self, url):
+        self.url = url
+        self.conn = None
+        self.page_script_hash = ''
+        self.widgets = {}
+        self.widget_states = {}
+
+    async def connect(self):
+        ws_url = self.url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self.conn = await websocket_connect(ws_url, subprotocols=['streamlit'])
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    async def rerun(self):
+        # Send the current widget states and wait for the script run to finish
+        back_msg = BackMsg()
+        client_state = back_msg.rerun_script
+        client_state.query_string = ''
+        client_state.page_script_hash = self.page_script_hash
+        for state in self.widget_states.values():
+            client_state.widget_states.widgets.append(state)
+
+        await self.conn.write_message(back_msg.SerializeToString(), binary=True)
+
+        widgets = {}
+        failed = False
+        while True:
+            payload = await self.conn.read_message()
+            if payload is None:
+                raise ConnectionError("Websocket closed by the server")
+
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            msg_type = msg.WhichOneof('type')
+
+            if msg_type == 'new_session':
+                self.page_script_hash = msg.new_session.page_script_hash
+            elif msg_type == 'delta' and msg.delta.HasField('new_element'):
+                element = msg.delta.new_element
+                element_type = element.WhichOneof('type')
+                if element_type in WIDGET_TYPES:
+                    widget = getattr(element, element_type)
+                    widgets[widget.label] = (element_type, widget)
+                elif element_type == 'exception':
+                    failed = True
+            elif msg_type == 'script_finished':
+                status = msg.script_finished
+                if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    failed = True
+                break
+
+        # Forget states of widgets that were not rendered in this run
+        self.widgets = widgets
+        live_ids = {widget.id for _, widget in widgets.values()}
+        self.widget_states = {k: v for k, v in self.widget_states.items() if k in live_ids}
+        return not failed
+
+    def set_widget(self, label, value):
+        if label not in self.widgets:
+            return False
+        element_type, widget = self.widgets[label]
+
+        state = self.widget_states.get(widget.id)
+        if state is None:
+            state = WidgetState(id=widget.id)
+
+        if element_type == 'multiselect':
+            state.string_array_value.data[:] = list(value)
+        elif element_type == 'slider':
+            state.double_array_value.data[:] = [float(v) for v in value]
+        elif 'raw_value' in widget.DESCRIPTOR.fields_by_name:
+            # Choice widgets serialized by option string (selectbox)
+            state.string_value = value
+        else:
+            # Choice widgets serialized by option index (radio)
+            state.int_value = list(widget.options).index(value)
+
+        self.widget_states[widget.id] = state
+        return True
+
+    def options(self, label):
+        if label not in self.widgets:
+            return []
+        return list(self.widgets[label][1].options)
+
+
+def scripted_interactions(session, rng):
+    # Yields one widget change per rerun, cycling through the dashboard controls
+    step = 0
+    last_yield = 0
+    while step - last_yield <= 6:
+        action = step % 6
+        step += 1
+
+        if action == 0:
+            options = session.options(LANGUAGES_LABEL)
+            if options:
+                k = rng.randint(1, min(10, len(options)))
+                last_yield = step
+                yield LANGUAGES_LABEL, rng.sample(options, k)
+        elif action == 1 and YEAR_RANGE_LABEL in session.widgets:
+            slider = session.widgets[YEAR_RANGE_LABEL][1]
+            low, high = int(slider.min), int(slider.max)
+            start = rng.randint(low, high)
+            last_yield = step
+            yield YEAR_RANGE_LABEL, (start, rng.randint(start, high))
+        elif action == 2:
+            options = session.options(METRIC_LABEL)
+            if options:
+                last_yield = step
+                yield METRIC_LABEL, rng.choice(options)
+        elif action == 3:
+            options = session.options(DATASET_LABEL)
+            if options:
+                last_yield = step
+                yield DATASET_LABEL, options[step // 6 % len(options)]
+        elif action == 4:
+            options = session.options(SORT_COLUMN_LABEL)
+            if options:
+                last_yield = step
+                yield SORT_COLUMN_LABEL, rng.choice(options)
+        elif action == 5:
+            options = session.options(SORT_ORDER_LABEL)
+            if options:
+                last_yield = step
+                yield SORT_ORDER_LABEL, rng.choice(options)
+
+
+async def run_session(url, iterations, think_time, seed, latencies, errors):
+    rng = random.Random(seed)
+    session = Session(url)
+    try:
+        await session.connect()
+        # Initial page load
+        start = time.perf_counter()
+        ok = await session.rerun()
+        latencies.append(('load', time.perf_counter() - start))
+        if not ok:
+            errors.append('load')
+
+        interactions = scripted_interactions(session, rng)
+        for _ in range(iterations):
+            interaction = next(interactions, None)
+            if interaction is None:
+                # None of the scripted widgets are on the page
+                break
+            label, value = interaction
+            session.set_widget(label, value)
+
+            start = time.perf_counter()
+            ok = await session.rerun()
+            latencies.append((label, time.perf_counter() - start))
+            if not ok:
+                errors.append(label)
+
+            if think_time > 0:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+    except Exception as e:
+        print(f"Error: {e}")
+        errors.append('session')
+    finally:
+        session.close()
+
+
+async def run_level(url, pid, concurrency, iterations, think_time, seed):
+    latencies = []
+    errors = []
+    rss_samples = []
+
+    sampler = asyncio.ensure_future(sample_rss(pid, rss_samples)) if pid else None
+    baseline_rss = read_rss(pid) if pid else None
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        run_session(url, iterations, think_time, seed + i, latencies, errors)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    if sampler is not None:
+        sampler.cancel()
+
+    values = np.array([latency for _, latency in latencies]) if latencies else np.array([np.nan])
+    return {
+        'concurrency': concurrency,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'p50_ms': np.percentile(values, 50) * 1000,
+        'p90_ms': np.percentile(values, 90) * 1000,
+        'p99_ms': np.percentile(values, 99) * 1000,
+        'max_ms': values.max() * 1000,
+        'throughput_rps': len(latencies) / elapsed if elapsed > 0 else np.nan,
+        'rss_start_mb': baseline_rss / 2**20 if baseline_rss else np.nan,
+        'rss_peak_mb': max(rss_samples) / 2**20 if rss_samples else np.nan,
+    }
+
+
+def run_load_test(concurrency_levels, iterations=10, think_time=0.0, app_path=APP_PATH,
+                  port=8599, url=None, pid=None, restart=True, seed=0):
+    results = []
+    server = None
+
+    try:
+        for concurrency in concurrency_levels:
+            if url is not None:
+                target_url = url.rstrip('/')
+                target_pid = pid
+            elif server is None or restart:
+                # Fresh server per level so RSS reflects that level only
+                if server is not None:
+                    server.terminate()
+                    server.wait()
+                server = launch_server(app_path, port)
+                target_url = f'http://localhost:{port}'
+                target_pid = server.pid
+
+            wait_for_server(target_url)
+
+            # Warm up imports and caches outside of the measurement
+            asyncio.run(run_session(target_url, 0, 0, seed, [], []))
+
+            print(f"Running {concurrency} concurrent sessions x {iterations} interactions")
+            result = asyncio.run(run_level(target_url, target_pid, concurrency, iterations, think_time, seed))
+            results.append(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return pd.DataFrame(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Streamlit dashboard with concurrent sessions")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--iterations', type=int, default=10, help="Interactions per session")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Mean pause between interactions (s)")
+    parser.add_argument('--app', default=APP_PATH)
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--url', default=None, help="Target an already running server instead")
+    parser.add_argument('--pid', type=int, default=None, help="Server pid for RSS sampling with --url")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="Write the report to this CSV file")
+    args = parser.parse_args()
+
+    report = run_load_test(
+        args.concurrency,
+        iterations=args.iterations,
+        think_time=args.think_time,
+        app_path=args.app,
+        port=args.port,
+        url=args.url,
+        pid=args.pid,
+        seed=args.seed,
+    )
+
+    print(report.round(1).to_string(index=False))
+    if args.output:
+        report.to_csv(args.output, index=False, sep=';')
+
+
+if __name__ == '__main__':
+    main()
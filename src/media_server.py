@@ -0,0 +1,52 @@
+"""Local static server for the race chart videos.
+
+Serves the figure folder with HTTP range requests (206 Partial Content),
+ETags and cache headers, so browsers start playing the faststart MP4s after
+a few KB and seek without downloading the whole file. Streamlit's own static
+serving sends .mp4 files as text/plain, hence this small tornado server
+(tornado ships with Streamlit).
+
+Usage:
+    python media_server.py --port 8502
+    BIO_LANG_RACE_MEDIA_URL=http://localhost:8502 streamlit run app.py
+"""
+
+import argparse
+import os
+
+import tornado.ioloop
+import tornado.web
+
+
+FIGURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'figure')
+
+MEDIA_EXTENSIONS = ('.mp4', '.jpg', '.png')
+
+
+class MediaHandler(tornado.web.StaticFileHandler):
+    # tornado's StaticFileHandler answers Range and If-None-Match requests and streams the file in chunks
+
+    def validate_absolute_path(self, root, absolute_path):
+        if not absolute_path.endswith(MEDIA_EXTENSIONS):
+            raise tornado.web.HTTPError(404)
+        return super().validate_absolute_path(root, absolute_path)
+
+    def set_extra_headers(self, path):
+        self.set_header('Accept-Ranges', 'bytes')
+        self.set_header('Cache-Control', 'public, max-age=3600')
+        self.set_header('Access-Control-Allow-Origin', '*')
+
+
+def make_app(media_dir=FIGURE_DIR):
+    return tornado.web.Application([(r'/(.*)', MediaHandler, {'path': os.path.abspath(media_dir)})])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the race chart videos with HTTP range requests")
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--dir', default=FIGURE_DIR, help="Folder with the videos (default: figure/)")
+    args = parser.parse_args()
+
+    make_app(args.dir).listen(args.port)
+    print(f"Serving {os.path.abspath(args.dir)} on http://localhost:{args.port}")
+    tornado.ioloop.IOLoop.current().start()
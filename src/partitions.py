@@ -0,0 +1,132 @@
+"""Year/topic partitioned dataset layout.
+
+Yearly datasets are stored one file per (reference topic, year), with the
+partition keys encoded in the path and dropped from the file itself:
+
+    data/partitioned/topic=<topic>/<dataset>/year=<year>.csv
+
+Datasets are `languages` (programming_language_x_<topic>.csv), `topics`
+(topics_x_<topic>.csv), `repo_years` (fact_repo_years_<topic>.csv) and
+`histograms` (log-binned star/fork counts, see histograms.py).
+`load_partitioned` lists the partition files and only reads the ones whose
+year falls in the requested range, so load time and memory follow the
+selection rather than the full history (the dashboard store reads every
+year once and shares it, see store.py). The `languages` and `topics`
+partitions are sparse (see series.py): the partition files are their year
+axis and only non-zero rows are stored.
+
+Usage (partitions the existing CSVs of a topic):
+    python partitions.py bioinformatics
+"""
+
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from series import read_series, sparsify
+from tables import DATA_DIR, table_path
+
+
+PARTITION_ROOT = 'partitioned'
+
+SOURCE_FILES = {
+    'languages': 'programming_language_x_{topic}.csv',
+    'topics': 'topics_x_{topic}.csv',
+}
+
+PARTITION_DTYPES = {
+    'languages': {'stars': 'int64', 'forks': 'int64', 'language': 'str'},
+    'topics': {'stars': 'int64', 'forks': 'int64', 'topic': 'str'},
+    'repo_years': {'repo_id': 'int32', 'stars': 'int32', 'forks': 'int32'},
+    'histograms': {'language': 'str', 'metric': 'str', 'bin': 'int8', 'count': 'int32'},
+}
+
+YEAR_FILE = re.compile(r'^year=(\d+)\.csv$')
+TOPIC_DIR = re.compile(r'^topic=(.+)$')
+
+
+def partition_dir(data_dir, topic, dataset):
+    return os.path.join(data_dir, PARTITION_ROOT, f'topic={topic}', dataset)
+
+
+def list_topics(data_dir):
+    root = os.path.join(data_dir, PARTITION_ROOT)
+    if not os.path.isdir(root):
+        return []
+    return sorted(m.group(1) for m in map(TOPIC_DIR.match, os.listdir(root)) if m)
+
+
+def list_years(data_dir, topic, dataset):
+    directory = partition_dir(data_dir, topic, dataset)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(int(m.group(1)) for m in map(YEAR_FILE.match, os.listdir(directory)) if m)
+
+
+def write_partitioned(df, data_dir, topic, dataset, year_column='year', years=None):
+    # years: year axis of a sparse dataset, years without rows get an empty partition
+
+    directory = partition_dir(data_dir, topic, dataset)
+    os.makedirs(directory, exist_ok=True)
+
+    parts = {int(year): part for year, part in df.groupby(year_column)}
+    years = {int(year) for year in (years if years is not None else parts)}
+    for year in years:
+        part = parts.get(year, df.iloc[:0])
+        part.drop(columns=year_column).to_csv(os.path.join(directory, f'year={year}.csv'), index=False, sep=';')
+
+    # Remove partitions of years that are no longer in the dataset
+    for year in list_years(data_dir, topic, dataset):
+        if year not in years:
+            os.remove(os.path.join(directory, f'year={year}.csv'))
+
+
+def load_partitioned(data_dir, topic, dataset, year_range=None):
+
+    directory = partition_dir(data_dir, topic, dataset)
+    years = list_years(data_dir, topic, dataset)
+    if not years:
+        raise FileNotFoundError(f"No partitions for dataset '{dataset}' and topic '{topic}' in {directory}")
+
+    # Partition pruning: only files intersecting the year range are read
+    if year_range is not None:
+        selected = [year for year in years if year_range[0] <= year <= year_range[1]]
+    else:
+        selected = years
+
+    dtype = PARTITION_DTYPES.get(dataset)
+    parts = []
+    for year in selected:
+        part = pd.read_csv(os.path.join(directory, f'year={year}.csv'), sep=';', header=0, dtype=dtype, keep_default_na=False)
+        part.insert(0, 'year', np.int16(year))
+        parts.append(part)
+
+    if not parts:
+        # Empty frame with the dataset columns
+        part = pd.read_csv(os.path.join(directory, f'year={years[0]}.csv'), sep=';', header=0, dtype=dtype, nrows=0)
+        part.insert(0, 'year', pd.Series(dtype='int16'))
+        return part
+
+    return pd.concat(parts, ignore_index=True)
+
+
+if __name__ == '__main__':
+    topic = sys.argv[1] if len(sys.argv) > 1 else 'bioinformatics'
+
+    datasets = {dataset: os.path.join(DATA_DIR, filename.format(topic=topic)) for dataset, filename in SOURCE_FILES.items()}
+    datasets['repo_years'] = table_path(DATA_DIR, topic, 'repo_years')
+
+    for dataset, path in datasets.items():
+        if not os.path.exists(path):
+            print(f"Skipping {dataset}: {path} not found")
+            continue
+        if dataset in SOURCE_FILES:
+            df, years = read_series(path)
+            write_partitioned(sparsify(df), DATA_DIR, topic, dataset, years=years)
+        else:
+            df = pd.read_csv(path, sep=';', header=0, keep_default_na=False)
+            write_partitioned(df, DATA_DIR, topic, dataset)
+        print(f"{dataset}: {len(list_years(DATA_DIR, topic, dataset))} partitions")
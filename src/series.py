@@ -0,0 +1,74 @@
+"""Sparse long-format yearly series.
+
+Language and topic stats are (year, entity, stars, forks) rows. Most
+entities only appear in a few years, so the dense (every entity x every
+year) layout is mostly zeros. Series are stored sparse: only rows with a
+non-zero metric are written, next to a small year axis descriptor
+(`<name>_years.csv`) listing every year of the series. Readers densify on
+demand, for the entities they actually plot:
+
+    df, years = read_series('../data/topics_x_bioinformatics.csv')
+    df_wide = to_wide(df, 'topic', 'stars', years, entities=top_entities(df, 'topic', 'stars', 10))
+
+Files written before the sparse layout (dense, no descriptor) are read as is.
+"""
+
+import os
+
+import pandas as pd
+
+
+METRICS = ('stars', 'forks')
+
+
+def sparsify(df, metrics=METRICS):
+    # Drop the rows where every metric is zero
+    return df[(df[list(metrics)] != 0).any(axis=1)].reset_index(drop=True)
+
+
+def axis_path(path):
+    return os.path.splitext(path)[0] + '_years.csv'
+
+
+def write_series(df, path, year_column='year', metrics=METRICS):
+    # Non-zero rows + year axis descriptor; returns the number of rows written
+    years = sorted(int(year) for year in df[year_column].unique())
+    df_sparse = sparsify(df, metrics)
+
+    df_sparse.to_csv(path, index=False, sep=';')
+    pd.DataFrame({year_column: years}).to_csv(axis_path(path), index=False, sep=';')
+    return len(df_sparse)
+
+
+def read_series(path, year_column='year'):
+    # (sparse rows, years of the series)
+    df = pd.read_csv(path, sep=';', header=0, keep_default_na=False)
+    if os.path.exists(axis_path(path)):
+        years = pd.read_csv(axis_path(path), sep=';', header=0)[year_column].tolist()
+    else:
+        years = sorted(df[year_column].unique().tolist())
+    return df, years
+
+
+def densify(df, entity, years, entities=None, metrics=METRICS, year_column='year'):
+    # Dense (year, entity) grid with zeros for the missing rows, only for `entities`
+    # (default: the entities present in df). Rows are ordered by year then entity.
+    if entities is None:
+        entities = df[entity].unique()
+    index = pd.MultiIndex.from_product([list(years), sorted(entities)], names=[year_column, entity])
+
+    metrics = [metric for metric in metrics if metric in df.columns]
+    df_dense = df.set_index([year_column, entity])[metrics].reindex(index, fill_value=0).reset_index()
+    return df_dense.astype({year_column: df[year_column].dtype})
+
+
+def top_entities(df, entity, metric, n, year_column='year'):
+    # Entities ranked in the top n of at least one year, i.e. every entity a bar chart race of n bars shows
+    ranked = df.sort_values(metric, ascending=False, kind='stable')
+    return sorted(ranked.groupby(year_column).head(n)[entity].unique())
+
+
+def to_wide(df, entity, metric, years, entities=None, year_column='year'):
+    # years x entities table of one metric, densified for `entities` only
+    df_dense = densify(df, entity, years, entities, metrics=(metric,), year_column=year_column)
+    return df_dense.pivot(index=year_column, columns=entity, values=metric)
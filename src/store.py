@@ -0,0 +1,217 @@
+"""Read-only dataset store shared by every dashboard session.
+
+Streamlit runs each session as a thread of the same process. Instead of
+every session loading its own copy of the partitions, `shared_store` loads
+all years of a reference topic once per process and hands the same
+`DatasetStore` to everyone. The frames are sorted by year, so a year range
+is a contiguous row slice: `select` returns a view on the shared frame, not
+a copy. Further filters (languages, a year) are boolean masks applied by the
+caller for the duration of a request. Nothing may modify the stored frames.
+
+This gives up the partition pruning of `load_partitioned` for the
+dashboard: every year is read once per process, whatever the selected
+range. The default selection covers all years, so the first session read
+them all anyway, and one shared copy costs less than a pruned copy per
+session. Pruning still applies to the other readers (SQL build, scripts).
+
+Refreshed datasets are picked up without restarting the dashboard. The
+pipeline writes a manifest (`_manifest.json` in the partition folder of the
+topic) with the content hash of the files once they are all written. A
+watcher thread polls it, builds the new store in the background, checks the
+files still match the announced version, runs the registered warmups on it
+(the app fills its caches for the default views), then swaps it in. Reruns
+already running keep the store they started with. A manifest whose files do
+not match is skipped until the manifest is written again.
+
+Usage (writes the manifest of a topic):
+    python store.py bioinformatics
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from partitions import PARTITION_ROOT, list_years, load_partitioned
+from tables import DATA_DIR, canonical_tables, load_tables, load_topic_mapping, mapping_path, repos_view, table_path
+
+
+STATS_DATASETS = {'language': 'languages', 'topic': 'topics'}
+STORE_TABLES = ('languages', 'topics', 'repos')
+
+MANIFEST_FILE = '_manifest.json'
+
+
+class DatasetStore:
+    """All years of one reference topic, loaded once and never modified."""
+
+    def __init__(self, data_dir, topic, version=None):
+        self.version = version or read_version(data_dir, topic)
+        # Raw topics of the tables merged with the normalization mapping
+        self.repo_tables = canonical_tables(load_tables(data_dir, topic, tables=STORE_TABLES), load_topic_mapping(data_dir, topic))
+
+        self.frames = {}
+        self.years = {}
+        for entity, dataset in STATS_DATASETS.items():
+            self.frames[entity] = sorted_by_year(load_partitioned(data_dir, topic, dataset), 'year')
+            # Year axis of the sparse stats, used to densify the plotted series
+            self.years[entity] = list_years(data_dir, topic, dataset)
+
+        repo_years = load_partitioned(data_dir, topic, 'repo_years')
+        self.frames['repos'] = sorted_by_year(repos_view({**self.repo_tables, 'repo_years': repo_years}), 'selected_year')
+        # Log-binned star/fork counts per (year, language), summed for the distribution chart
+        self.frames['histograms'] = sorted_by_year(load_partitioned(data_dir, topic, 'histograms'), 'year')
+
+        self._year_columns = {name: df['selected_year' if name == 'repos' else 'year'].to_numpy() for name, df in self.frames.items()}
+
+    def select(self, name, year_range):
+        # Rows of the year range, as a view on the shared frame
+        years = self._year_columns[name]
+        start = np.searchsorted(years, year_range[0], side='left')
+        stop = np.searchsorted(years, year_range[1], side='right')
+        return self.frames[name].iloc[start:stop]
+
+    def years_in(self, entity, year_range):
+        return [year for year in self.years[entity] if year_range[0] <= year <= year_range[1]]
+
+
+def sorted_by_year(df, year_column):
+    return df.sort_values(year_column, kind='stable').reset_index(drop=True)
+
+
+# Versions
+
+def dataset_files(data_dir, topic):
+    # Files read by the store: the partitions of the topic, its repository tables and topic mapping
+    files = [table_path(data_dir, topic, table) for table in STORE_TABLES] + [mapping_path(data_dir, topic)]
+    for dirpath, _, filenames in os.walk(os.path.join(data_dir, PARTITION_ROOT, f'topic={topic}')):
+        files += [os.path.join(dirpath, filename) for filename in filenames if filename.endswith('.csv')]
+    return sorted(path for path in files if os.path.exists(path))
+
+
+def content_hash(data_dir, topic):
+    digest = hashlib.sha256()
+    for path in dataset_files(data_dir, topic):
+        digest.update(os.path.relpath(path, data_dir).replace(os.sep, '/').encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+
+def manifest_path(data_dir, topic):
+    return os.path.join(data_dir, PARTITION_ROOT, f'topic={topic}', MANIFEST_FILE)
+
+
+def write_manifest(data_dir, topic):
+    # To be written last, once every file of the new version is in place
+    path = manifest_path(data_dir, topic)
+    manifest = {
+        'version': content_hash(data_dir, topic),
+        'written_at': datetime.now().isoformat(timespec='seconds'),
+        'files': [os.path.relpath(p, data_dir).replace(os.sep, '/') for p in dataset_files(data_dir, topic)],
+    }
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(path + '.tmp', path)
+    return manifest['version']
+
+
+def read_version(data_dir, topic):
+    # Version announced by the manifest, or the content hash of the files without one
+    path = manifest_path(data_dir, topic)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)['version']
+    return content_hash(data_dir, topic)
+
+
+# Shared stores
+
+_stores = {}
+_watchers = {}
+_warmups = {}
+_failed_versions = {}
+_stores_lock = threading.Lock()
+
+
+def store_key(data_dir, topic):
+    return (os.path.abspath(data_dir), topic)
+
+
+def shared_store(data_dir, topic, watch_interval=None):
+    # One store per (data folder, topic) for the whole process, reloaded in the
+    # background every watch_interval seconds when a new version is published
+    key = store_key(data_dir, topic)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = DatasetStore(data_dir, topic)
+        if watch_interval and key not in _watchers:
+            _watchers[key] = threading.Thread(target=watch_store, args=(data_dir, topic, watch_interval), daemon=True)
+            _watchers[key].start()
+        return _stores[key]
+
+
+def add_warmup(data_dir, topic, name, warmup):
+    # warmup(store) runs in the watcher thread on each new version, before it is swapped in.
+    # Registered again on every rerun, the name keeps a single entry.
+    with _stores_lock:
+        _warmups.setdefault(store_key(data_dir, topic), {})[name] = warmup
+
+
+def reload_store(data_dir, topic):
+    # Build the new version next to the current one, swap it in if the files did not change meanwhile
+    key = store_key(data_dir, topic)
+    version = read_version(data_dir, topic)
+    current = _stores.get(key)
+    if current is not None and current.version == version:
+        return False
+
+    # Same manifest as a previous failed check (the written_at time changes on every write)
+    path = manifest_path(data_dir, topic)
+    stamp = (version, os.path.getmtime(path) if os.path.exists(path) else None)
+    if _failed_versions.get(key) == stamp:
+        return False
+    if content_hash(data_dir, topic) != version:
+        # The manifest is written last, files that do not match it will not catch up by themselves
+        _failed_versions[key] = stamp
+        print(f"Skipping {topic} dataset version {version}: the files do not match the manifest")
+        return False
+
+    store = DatasetStore(data_dir, topic, version)
+    if content_hash(data_dir, topic) != version:
+        # Files changed while loading, checked again on the next poll
+        return False
+
+    with _stores_lock:
+        warmups = list(_warmups.get(key, {}).items())
+    for name, warmup in warmups:
+        try:
+            warmup(store)
+        except Exception as e:
+            # Caches are filled on demand instead
+            print(f"Error in {name} warmup: {e}")
+
+    with _stores_lock:
+        _stores[key] = store
+    print(f"Reloaded {topic} dataset: version {version}")
+    return True
+
+
+def watch_store(data_dir, topic, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            reload_store(data_dir, topic)
+        except Exception as e:
+            # Keep serving the current version
+            print(f"Error: {e}")
+
+
+if __name__ == '__main__':
+    topic = sys.argv[1] if len(sys.argv) > 1 else 'bioinformatics'
+    print(f"{topic}: version {write_manifest(DATA_DIR, topic)}")
@@ -0,0 +1,182 @@
+"""Normalized repository tables.
+
+The collected repos repeat a repository's name, creation date, language
+and topic list for every year it was selected in. This module splits them
+into small dimension tables keyed by integer ids and a slim (repo, year)
+fact table:
+
+    dim_languages_<topic>.csv   language_id;language
+    dim_topics_<topic>.csv      topic_id;topic
+    dim_repos_<topic>.csv       repo_id;name;created;language_id;topic_ids
+    fact_repo_years_<topic>.csv repo_id;year;stars;forks
+
+`topic_ids` is a space separated list of topic ids. Ids are positions in the
+dimension tables, so language and topic ids can be used directly as
+categorical codes.
+
+`repos_view` (+ `topic_names`) gives back the denormalized layout, which is
+no longer stored.
+
+The tables keep the raw GitHub topics. The topic normalization mapping
+(`topic_mapping_<topic>.csv`, see topic_normalize.py) is applied when they
+are read for aggregation, with `canonical_tables`, so that a merge can be
+undone by editing the aliases and rebuilding the mapping.
+
+Usage (converts a list_of_repos CSV written by earlier versions):
+    python tables.py bioinformatics
+"""
+
+import ast
+import os
+import sys
+
+import pandas as pd
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+TABLE_FILES = {
+    'languages': 'dim_languages_{topic}.csv',
+    'topics': 'dim_topics_{topic}.csv',
+    'repos': 'dim_repos_{topic}.csv',
+    'repo_years': 'fact_repo_years_{topic}.csv',
+}
+
+MAPPING_FILE = 'topic_mapping_{topic}.csv'
+
+TABLE_DTYPES = {
+    'languages': {'language_id': 'int16'},
+    'topics': {'topic_id': 'int32'},
+    'repos': {'repo_id': 'int32', 'language_id': 'int16', 'topic_ids': 'str'},
+    'repo_years': {'repo_id': 'int32', 'year': 'int16', 'stars': 'int32', 'forks': 'int32'},
+}
+
+
+def table_path(data_dir, topic, table):
+    return os.path.join(data_dir, TABLE_FILES[table].format(topic=topic))
+
+
+def mapping_path(data_dir, topic):
+    return os.path.join(data_dir, MAPPING_FILE.format(topic=topic))
+
+
+def parse_topics(value):
+    # Topic lists are stored as python list literals in the repos CSV
+    if isinstance(value, list):
+        return value
+    if pd.isna(value):
+        return []
+    return ast.literal_eval(value)
+
+
+def build_tables(df_repos):
+
+    df_repos = df_repos.dropna(subset=['language']).reset_index(drop=True)
+    topics_per_row = df_repos['topics'].apply(parse_topics)
+
+    # Dimensions, ids are positions in sorted order
+    languages = sorted(df_repos['language'].unique())
+    topics = sorted({t for row in topics_per_row for t in row})
+    language_ids = {language: i for i, language in enumerate(languages)}
+    topic_ids = {t: i for i, t in enumerate(topics)}
+
+    df_languages = pd.DataFrame({'language_id': range(len(languages)), 'language': languages})
+    df_topics = pd.DataFrame({'topic_id': range(len(topics)), 'topic': topics})
+
+    # One row per repository, keeping its most recent record
+    latest = df_repos.sort_values('selected_year').drop_duplicates('name', keep='last')
+    latest = latest.sort_values('name')
+    repo_ids = {name: i for i, name in enumerate(latest['name'])}
+
+    df_dim_repos = pd.DataFrame({
+        'repo_id': range(len(latest)),
+        'name': latest['name'].to_numpy(),
+        'created': latest['created'].to_numpy(),
+        'language_id': latest['language'].map(language_ids).to_numpy(),
+        'topic_ids': [' '.join(str(topic_ids[t]) for t in row) for row in topics_per_row[latest.index]],
+    })
+
+    df_repo_years = pd.DataFrame({
+        'repo_id': df_repos['name'].map(repo_ids),
+        'year': df_repos['selected_year'],
+        'stars': df_repos['stars'],
+        'forks': df_repos['forks'],
+    }).drop_duplicates(['repo_id', 'year']).sort_values(['year', 'repo_id']).reset_index(drop=True)
+
+    return {
+        'languages': df_languages,
+        'topics': df_topics,
+        'repos': df_dim_repos,
+        'repo_years': df_repo_years,
+    }
+
+
+def write_tables(tables, data_dir, topic):
+    for table, df in tables.items():
+        df.to_csv(table_path(data_dir, topic, table), index=False, sep=';')
+
+
+def load_tables(data_dir, topic, tables=tuple(TABLE_FILES)):
+    return {
+        table: pd.read_csv(table_path(data_dir, topic, table), sep=';', header=0, dtype=TABLE_DTYPES[table], keep_default_na=False)
+        for table in tables
+    }
+
+
+def load_topic_mapping(data_dir, topic):
+    # {raw topic: canonical topic}, empty when the topics of the tables were never normalized
+    path = mapping_path(data_dir, topic)
+    if not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, sep=';', header=0, keep_default_na=False)
+    return dict(zip(df['raw'], df['canonical']))
+
+
+def canonical_tables(tables, mapping):
+    # Tables with the topics of the mapping, renumbered in sorted order like build_tables does.
+    # A repo's topic ids keep their order without duplicates, repo and language ids do not change.
+    if not mapping:
+        return tables
+    raw_topics = tables['topics']['topic'].tolist()
+    canonical = sorted({mapping.get(t, t) for t in raw_topics})
+    canonical_ids = {t: str(i) for i, t in enumerate(canonical)}
+    new_ids = [canonical_ids[mapping.get(t, t)] for t in raw_topics]
+
+    tables = dict(tables, topics=pd.DataFrame({'topic_id': range(len(canonical)), 'topic': canonical}).astype(TABLE_DTYPES['topics']))
+    if 'repos' in tables:
+        tables['repos'] = tables['repos'].assign(topic_ids=[
+            ' '.join(dict.fromkeys(new_ids[int(i)] for i in ids.split())) for ids in tables['repos']['topic_ids']
+        ])
+    return tables
+
+
+def repos_view(tables):
+    # Fact rows joined with the repository dimension on repo_id, in the
+    # list_of_repos layout used by the dashboard (language as categorical codes)
+    df_dim_repos = tables['repos']
+    df = tables['repo_years'].merge(df_dim_repos[['repo_id', 'name', 'created', 'language_id']], on='repo_id')
+
+    df['language'] = pd.Categorical.from_codes(df['language_id'], categories=tables['languages']['language'])
+    df = df.rename(columns={'year': 'selected_year'})
+
+    return df[['repo_id', 'name', 'stars', 'created', 'forks', 'language', 'selected_year']]
+
+
+def topic_names(tables, repo_ids):
+    # Topic lists for the given repos, only materialized when displayed
+    topic_ids = tables['repos'].set_index('repo_id')['topic_ids']
+    all_topics = tables['topics']['topic'].to_numpy()
+    return [
+        [all_topics[int(i)] for i in ids.split()] if ids else []
+        for ids in topic_ids.reindex(repo_ids).fillna('')
+    ]
+
+
+if __name__ == '__main__':
+    topic = sys.argv[1] if len(sys.argv) > 1 else 'bioinformatics'
+    df_repos = pd.read_csv(os.path.join(DATA_DIR, 'list_of_repos_' + topic + '.csv'), sep=';', header=0, on_bad_lines='skip')
+    tables = build_tables(df_repos)
+    write_tables(tables, DATA_DIR, topic)
+
+    for table, df in tables.items():
+        print(f"{TABLE_FILES[table].format(topic=topic)}: {len(df)} rows")
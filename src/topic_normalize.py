@@ -0,0 +1,225 @@
+"""Topic vocabulary normalization.
+
+Raw GitHub topics contain many near-duplicates (`rna-seq`/`rnaseq`,
+`genome`/`genomes`, typos, ...). Topics are normalized in three steps:
+
+1. A cheap rule-based key: lowercase, `_`/spaces turned into `-`, plural
+   `s` dropped from each word, hyphens ignored.
+2. Keys are indexed with MinHash signatures of their character 3-grams and
+   locality sensitive hashing (banding), so that only keys sharing a bucket
+   are compared. Candidate pairs above a Jaccard threshold are merged with a
+   union-find, in near-linear time overall.
+3. Each cluster is mapped to its most used raw topic, unless a canonical
+   mapping file (`raw;canonical`, see `data/topic_aliases.csv`) says
+   otherwise. Mapping a topic to itself keeps it out of any cluster.
+
+The repository tables keep the raw topics. The mapping is written next to
+them (`topic_mapping_<topic>.csv`) and applied when aggregating: the topic
+stats are computed from the normalized lists, and the dashboard reads the
+tables through `tables.canonical_tables`. Editing the aliases and applying
+again can therefore split topics as well as merge them.
+
+Usage (report on the repository tables of a topic, --apply to write the
+mapping, the topic stats and partitions, then the manifest):
+    python topic_normalize.py bioinformatics [--apply]
+"""
+
+import argparse
+import os
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from partitions import write_partitioned
+from series import sparsify, write_series
+from store import write_manifest
+from tables import DATA_DIR, load_tables, mapping_path, repos_view, topic_names
+
+
+NGRAM = 3
+NUM_PERM = 64
+BANDS = 16
+THRESHOLD = 0.8
+PRIME = (1 << 31) - 1
+
+ALIASES_FILE = 'topic_aliases.csv'
+
+
+def topic_key(topic):
+    # Rule-based key shared by trivial variants
+    words = re.split(r'[-_\s]+', topic.strip().lower())
+    words = [w[:-3] + 'y' if w.endswith('ies') and len(w) > 4
+             else w[:-1] if w.endswith('s') and len(w) > 3 and not w.endswith(('ss', 'us', 'is'))
+             else w
+             for w in words if w]
+    return ''.join(words)
+
+
+def ngrams(key, n=NGRAM):
+    padded = f'^{key}$'
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+def minhash_signatures(keys, num_perm=NUM_PERM, seed=0, chunk=8):
+    # keys x num_perm MinHash matrix of the 3-gram sets, computed with numpy
+    gram_sets = [sorted(ngrams(key)) for key in keys]
+    lengths = np.array([len(grams) for grams in gram_sets])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    hashes = np.array([zlib.crc32(gram.encode('utf-8')) for grams in gram_sets for gram in grams], dtype=np.uint64)
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, PRIME, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(keys), num_perm), dtype=np.uint64)
+    for start in range(0, num_perm, chunk):
+        # (a * x + b) mod p with a, b < p < 2^31 on 32 bit hashes: below 2^63, no uint64 overflow
+        stop = min(start + chunk, num_perm)
+        values = (a[start:stop, None] * hashes[None, :] + b[start:stop, None]) % np.uint64(PRIME)
+        signatures[:, start:stop] = np.minimum.reduceat(values, offsets, axis=1).T
+
+    return signatures, [set(grams) for grams in gram_sets]
+
+
+def candidate_pairs(signatures, bands=BANDS):
+    # Keys sharing at least one band of their signature
+    rows = signatures.shape[1] // bands
+    pairs = set()
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        bucket_keys = block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel()
+        _, bucket, counts = np.unique(bucket_keys, return_inverse=True, return_counts=True)
+
+        shared = np.flatnonzero(counts[bucket] > 1)
+        order = shared[np.argsort(bucket[shared], kind='stable')]
+        for group in np.split(order, np.flatnonzero(np.diff(bucket[order])) + 1):
+            for i in range(len(group)):
+                for j in range(i + 1, len(group)):
+                    pairs.add((int(group[i]), int(group[j])))
+    return pairs
+
+
+def find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def load_aliases(path):
+    if path is None or not os.path.exists(path):
+        return {}
+    df = pd.read_csv(path, sep=';', header=0, comment='#', keep_default_na=False)
+    return dict(zip(df['raw'], df['canonical']))
+
+
+def build_topic_mapping(topic_counts, aliases=None, threshold=THRESHOLD):
+    # topic_counts: {raw topic: number of repos}. Returns {raw topic: canonical topic}
+    aliases = aliases or {}
+    topics = sorted(topic_counts)
+
+    # 1. Rule-based keys, topics pinned by the aliases keep their own key
+    key_of = {t: ('=' + t if t in aliases else topic_key(t)) for t in topics}
+    keys = sorted(set(key_of.values()))
+    key_index = {key: i for i, key in enumerate(keys)}
+
+    # 2. MinHash LSH candidates, verified on exact 3-gram Jaccard
+    parent = list(range(len(keys)))
+    free = [i for i, key in enumerate(keys) if not key.startswith('=')]
+    if len(free) > 1:
+        signatures, gram_sets = minhash_signatures([keys[i] for i in free])
+        for i, j in candidate_pairs(signatures):
+            a, b = gram_sets[i], gram_sets[j]
+            if len(a & b) / len(a | b) >= threshold:
+                parent[find(parent, free[i])] = find(parent, free[j])
+
+    clusters = {}
+    for t in topics:
+        clusters.setdefault(find(parent, key_index[key_of[t]]), []).append(t)
+
+    # 3. Canonical topic: alias if any, else the most used variant (then shortest)
+    mapping = {}
+    for members in clusters.values():
+        canonical = min(members, key=lambda t: (-topic_counts[t], len(t), t))
+        for t in members:
+            mapping[t] = aliases.get(t, canonical)
+
+    # Aliases may also point to topics outside their cluster
+    return {t: aliases.get(canonical, canonical) for t, canonical in mapping.items()}
+
+
+def normalize_topic_lists(topic_lists, mapping):
+    # Apply the mapping to each repo's topic list, without duplicates
+    return [list(dict.fromkeys(mapping.get(t, t) for t in topics)) for topics in topic_lists]
+
+
+def topic_year_stats(df_repos, topic, exclude=('python',)):
+    # Stars and forks per year per co-occurring topic, dense over the years of the repos, as
+    # computed by the collection notebook (stars are cumulated over the years, forks are not)
+    years = sorted(df_repos['selected_year'].unique())
+    df = df_repos[['selected_year', 'stars', 'forks', 'topics']].explode('topics').dropna(subset=['topics'])
+    df = df[~df['topics'].isin([topic, *exclude])]
+
+    sums = df.groupby(['topics', 'selected_year'])[['stars', 'forks']].sum()
+    index = pd.MultiIndex.from_product([sorted(df['topics'].unique()), years], names=['topic', 'year'])
+    df_stats = sums.reindex(index, fill_value=0).reset_index()
+    df_stats['stars'] = df_stats.groupby('topic')['stars'].cumsum()
+
+    return df_stats[['year', 'stars', 'forks', 'topic']].astype({'year': 'int64', 'stars': 'int64', 'forks': 'int64'})
+
+
+def normalization_report(df_repos, mapping, topic):
+    # Cardinality before/after and the rows of the sparse (topic, year) stats as stored
+    raw = {t for topics in df_repos['topics'] for t in topics}
+    canonical = {mapping.get(t, t) for t in raw}
+    df_normalized = df_repos.assign(topics=normalize_topic_lists(df_repos['topics'], mapping))
+
+    return {
+        'raw_topics': len(raw),
+        'canonical_topics': len(canonical),
+        'merged_topics': len(raw) - len(canonical),
+        'topic_reduction_pct': 100 * (1 - len(canonical) / len(raw)) if raw else 0.0,
+        'topic_year_rows_before': len(sparsify(topic_year_stats(df_repos, topic))),
+        'topic_year_rows_after': len(sparsify(topic_year_stats(df_normalized, topic))),
+    }
+
+
+def clusters_table(mapping):
+    # Merged variants only, one row per raw topic
+    df = pd.DataFrame(sorted(mapping.items()), columns=['raw', 'canonical'])
+    sizes = df.groupby('canonical')['raw'].transform('size')
+    return df[sizes > 1].sort_values(['canonical', 'raw']).reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Merge near-duplicate topics of the repository tables of a topic")
+    parser.add_argument('topic', nargs='?', default='bioinformatics')
+    parser.add_argument('--apply', action='store_true', help="Write the mapping, then the topic stats and partitions with the normalized topics")
+    args = parser.parse_args()
+    topic = args.topic
+
+    repo_tables = load_tables(DATA_DIR, topic)
+    df_repos = repos_view(repo_tables)
+    df_repos['topics'] = topic_names(repo_tables, df_repos['repo_id'])
+
+    counts = Counter(t for topics in df_repos['topics'] for t in set(topics))
+    mapping = build_topic_mapping(counts, aliases=load_aliases(os.path.join(DATA_DIR, ALIASES_FILE)))
+
+    print(clusters_table(mapping).to_string(index=False))
+    for name, value in normalization_report(df_repos, mapping, topic).items():
+        print(f"{name}: {value:,.1f}" if isinstance(value, float) else f"{name}: {value:,}")
+
+    if args.apply:
+        pd.DataFrame(sorted(mapping.items()), columns=['raw', 'canonical']).to_csv(mapping_path(DATA_DIR, topic), index=False, sep=';')
+        df_normalized = df_repos.assign(topics=normalize_topic_lists(df_repos['topics'], mapping))
+
+        df_stats_topic = topic_year_stats(df_normalized, topic)
+        years = sorted(df_normalized['selected_year'].unique())
+        write_series(df_stats_topic, os.path.join(DATA_DIR, f'topics_x_{topic}.csv'))
+        write_partitioned(sparsify(df_stats_topic), DATA_DIR, topic, 'topics', years=years)
+
+        # Written last, a running dashboard reloads the new version
+        print(f"Applied to {topic}: {len(set(mapping.values()))} topics, version {write_manifest(DATA_DIR, topic)}")
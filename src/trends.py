@@ -0,0 +1,93 @@
+"""Vectorized trend analytics over every language or topic at once.
+
+The yearly stats are turned into a dense year x entity matrix, and growth,
+share, rank and momentum are computed as NumPy array operations on the whole
+matrix instead of per-entity groupbys. Years are the ones present in the
+data, so "year over year" means from one available year to the next.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def entity_matrix(df, entity, metric):
+    # Long (year, entity, metric) rows -> years, entity names, matrix[year, entity]
+    years, year_idx = np.unique(df['year'].to_numpy(), return_inverse=True)
+    names, name_idx = np.unique(df[entity].to_numpy().astype(str), return_inverse=True)
+
+    flat = year_idx * len(names) + name_idx
+    values = np.bincount(flat, weights=df[metric].to_numpy(dtype='float64'), minlength=len(years) * len(names))
+
+    return years, names, values.reshape(len(years), len(names))
+
+
+def dense_rank(matrix):
+    # Dense rank of every entity within each year, 1 = highest value
+    order = np.argsort(-matrix, axis=1, kind='stable')
+    sorted_values = np.take_along_axis(matrix, order, axis=1)
+
+    new_value = np.diff(sorted_values, axis=1) != 0
+    sorted_ranks = np.concatenate([np.ones((matrix.shape[0], 1), dtype=int), 1 + np.cumsum(new_value, axis=1)], axis=1)
+
+    ranks = np.empty_like(sorted_ranks)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=1)
+    return ranks
+
+
+def rolling_mean(matrix, window):
+    # Trailing mean over the last `window` years (fewer at the start)
+    cumsum = np.cumsum(np.vstack([np.zeros((1, matrix.shape[1])), matrix]), axis=0)
+    counts = np.minimum(np.arange(1, matrix.shape[0] + 1), window)[:, None]
+    starts = np.arange(matrix.shape[0]) + 1 - counts[:, 0]
+    return (cumsum[1:] - cumsum[starts]) / counts
+
+
+def trailing_slope(matrix, window):
+    # Least squares slope over the last `window` years, per year and entity
+    slopes = np.full(matrix.shape, np.nan)
+    for end in range(1, matrix.shape[0]):
+        block = matrix[max(0, end - window + 1):end + 1]
+        x = np.arange(block.shape[0]) - (block.shape[0] - 1) / 2
+        slopes[end] = (x[:, None] * (block - block.mean(axis=0))).sum(axis=0) / (x ** 2).sum()
+    return slopes
+
+
+def trend_metrics(matrix, window=3):
+
+    totals = matrix.sum(axis=1, keepdims=True)
+    share = np.divide(matrix, totals, out=np.zeros_like(matrix), where=totals > 0) * 100
+
+    previous = np.vstack([np.full((1, matrix.shape[1]), np.nan), matrix[:-1]])
+    growth = np.divide(matrix - previous, previous, out=np.full_like(matrix, np.nan), where=previous > 0) * 100
+
+    ranks = dense_rank(matrix)
+    rank_change = np.vstack([np.zeros((1, matrix.shape[1]), dtype=int), ranks[:-1] - ranks[1:]])
+
+    return {
+        'share': share,
+        'rolling_share': rolling_mean(share, window),
+        'growth': growth,
+        'rank': ranks,
+        'rank_change': rank_change,
+        'momentum': trailing_slope(share, window),
+    }
+
+
+def movers(df, entity, metric, year=None, window=3, min_value=0):
+    # One row per entity for the given year (latest by default), fastest rising first.
+    # Momentum is the trend of the share over the last `window` years (percentage points per year).
+    years, names, matrix = entity_matrix(df, entity, metric)
+    if len(years) == 0:
+        return pd.DataFrame(columns=[entity, metric, 'share', 'rolling_share', 'growth', 'rank', 'rank_change', 'momentum'])
+
+    metrics = trend_metrics(matrix, window)
+    row = len(years) - 1 if year is None else int(np.searchsorted(years, year))
+
+    df_movers = pd.DataFrame({
+        entity: names,
+        metric: matrix[row],
+        **{name: values[row] for name, values in metrics.items()}
+    })
+    df_movers = df_movers[df_movers[metric] >= min_value]
+
+    return df_movers.sort_values(['momentum', metric], ascending=False, kind='stable').reset_index(drop=True)
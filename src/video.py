@@ -0,0 +1,187 @@
+"""Race chart videos prepared for streaming.
+
+bar_chart_race writes MP4 files with the `moov` index after the media data,
+so a browser has to fetch the whole file before it can start playing.
+`prepare_video` turns each rendered video into:
+
+- <name>.mp4: same stream with the `moov` atom moved in front (faststart),
+  rewritten in Python without re-encoding,
+- <name>_small.mp4: a 640 px wide, lower bitrate variant for small screens,
+- <name>_poster.jpg: the last frame, shown before playback starts.
+
+The variant and the poster are encoded with ffmpeg (the executable used by
+matplotlib to render the videos). The dashboard plays the files from local
+storage; the small variant and the poster are only used when they are
+served by media_server.py (see the README).
+
+Usage:
+    python video.py ../figure/*.mp4 --ffmpeg /usr/bin/ffmpeg
+"""
+
+import argparse
+import html
+import os
+import struct
+import subprocess
+
+
+SMALL_WIDTH = 640
+SMALL_CRF = 30
+SMALL_SCREEN_MAX_WIDTH = 900
+
+CONTAINER_ATOMS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+
+
+def variant_paths(path):
+    stem = os.path.splitext(path)[0]
+    return {'full': path, 'small': stem + '_small.mp4', 'poster': stem + '_poster.jpg'}
+
+
+def read_atoms(f, start, end):
+    # (type, offset, size, header size) of the atoms between start and end
+    atoms = []
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        size, kind = struct.unpack('>I4s', f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            raise ValueError(f"Invalid {kind!r} atom at offset {offset}")
+        atoms.append((kind, offset, size, header))
+        offset += size
+    return atoms
+
+
+def moov_first(kinds):
+    return b'moov' in kinds and (b'mdat' not in kinds or kinds.index(b'moov') < kinds.index(b'mdat'))
+
+
+def is_faststart(path):
+    with open(path, 'rb') as f:
+        return moov_first([kind for kind, _, _, _ in read_atoms(f, 0, os.path.getsize(path))])
+
+
+def shift_chunk_offsets(moov, shift):
+    # Add `shift` to every chunk offset (stco/co64 tables) of a moov atom
+    moov = bytearray(moov)
+
+    def walk(start, end):
+        offset = start
+        while offset + 8 <= end:
+            size, kind = struct.unpack_from('>I4s', moov, offset)
+            header = 8
+            if size == 1:
+                size = struct.unpack_from('>Q', moov, offset + 8)[0]
+                header = 16
+            if kind in CONTAINER_ATOMS:
+                walk(offset + header, offset + size)
+            elif kind in (b'stco', b'co64'):
+                count = struct.unpack_from('>I', moov, offset + header + 4)[0]
+                fmt = '>%d%s' % (count, 'I' if kind == b'stco' else 'Q')
+                table = offset + header + 8
+                values = [value + shift for value in struct.unpack_from(fmt, moov, table)]
+                if kind == b'stco' and values and max(values) >= 1 << 32:
+                    raise ValueError("Chunk offsets overflow 32 bits, re-encode with ffmpeg -movflags +faststart")
+                struct.pack_into(fmt, moov, table, *values)
+            offset += size
+
+    walk(0, len(moov))
+    return bytes(moov)
+
+
+def faststart(path, out_path=None):
+    # Move the moov atom before the media data. Returns False if it already is.
+    out_path = out_path or path
+    with open(path, 'rb') as f:
+        atoms = read_atoms(f, 0, os.path.getsize(path))
+        kinds = [kind for kind, _, _, _ in atoms]
+        if b'moov' not in kinds:
+            raise ValueError(f"No moov atom in {path}")
+        if moov_first(kinds):
+            return False
+
+        moov_index = kinds.index(b'moov')
+        first_data = kinds.index(b'mdat')
+        _, moov_offset, moov_size, _ = atoms[moov_index]
+        f.seek(moov_offset)
+        moov = shift_chunk_offsets(f.read(moov_size), moov_size)
+
+        # ftyp (and anything before the data) + moov + the rest, written next to the target then swapped in
+        tmp_path = out_path + '.tmp'
+        with open(tmp_path, 'wb') as out:
+            order = atoms[:first_data] + [None] + [atom for atom in atoms[first_data:] if atom[0] != b'moov']
+            for atom in order:
+                if atom is None:
+                    out.write(moov)
+                    continue
+                _, offset, size, _ = atom
+                f.seek(offset)
+                remaining = size
+                while remaining:
+                    chunk = f.read(min(remaining, 1 << 20))
+                    out.write(chunk)
+                    remaining -= len(chunk)
+
+    os.replace(tmp_path, out_path)
+    return True
+
+
+def render_small(path, out_path, ffmpeg='ffmpeg', width=SMALL_WIDTH, crf=SMALL_CRF):
+    subprocess.run([
+        ffmpeg, '-y', '-loglevel', 'error', '-i', path,
+        '-vf', f'scale={width}:-2', '-c:v', 'libx264', '-preset', 'slow', '-crf', str(crf),
+        '-pix_fmt', 'yuv420p', '-movflags', '+faststart', '-an', out_path
+    ], check=True)
+
+
+def render_poster(path, out_path, ffmpeg='ffmpeg'):
+    # Last frame = final ranking of the race
+    subprocess.run([
+        ffmpeg, '-y', '-loglevel', 'error', '-sseof', '-1', '-i', path,
+        '-frames:v', '1', '-q:v', '3', '-update', '1', out_path
+    ], check=True)
+
+
+def prepare_video(path, ffmpeg='ffmpeg'):
+    paths = variant_paths(path)
+    faststart(path)
+    render_small(path, paths['small'], ffmpeg)
+    render_poster(path, paths['poster'], ffmpeg)
+    return paths
+
+
+def video_html(base_url, path, small_screen_max_width=SMALL_SCREEN_MAX_WIDTH):
+    # <video> picking the variant from the viewport width; only variants present on disk are listed
+    paths = variant_paths(path)
+    url = lambda variant: html.escape(base_url.rstrip('/') + '/' + os.path.basename(paths[variant]))
+
+    poster = f' poster="{url("poster")}"' if os.path.exists(paths['poster']) else ''
+    sources = []
+    if os.path.exists(paths['small']):
+        sources.append(f'<source src="{url("small")}" type="video/mp4" media="(max-width: {small_screen_max_width}px)">')
+    sources.append(f'<source src="{url("full")}" type="video/mp4">')
+
+    return (
+        f'<video controls playsinline preload="metadata"{poster} style="width: 100%">'
+        + ''.join(sources)
+        + '</video>'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Faststart, small variant and poster for the race chart videos")
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--ffmpeg', default='ffmpeg')
+    args = parser.parse_args()
+
+    for path in args.videos:
+        if path.endswith('_small.mp4'):
+            continue
+        paths = prepare_video(path, args.ffmpeg)
+        sizes = ', '.join(f"{variant} {os.path.getsize(p) / 1024:.0f} KB" for variant, p in paths.items())
+        print(f"{path}: {sizes}")